@@ -0,0 +1,215 @@
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from http_cache import ResponseCache
+from json_stream import loads, read_records
+
+
+class ApiClient:
+    """Base class for API clients, sharing a pooled and retrying HTTP transport."""
+
+    # Status codes worth retrying: rate limiting and transient server errors.
+    retry_statuses = (429, 500, 502, 503, 504)
+    # Status codes of the responses kept in the cache.
+    cached_statuses = (200,)
+
+    # One semaphore per host, shared by every client in the process, with the
+    # limit it was created with.
+    _host_slots: dict[str, tuple[int, threading.BoundedSemaphore]] = {}
+    _host_slots_lock = threading.Lock()
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = None,
+        pool_size: int = 20,
+        max_per_host: int | None = None,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        timeout: float = 30,
+        verify: bool = False,
+        cache: ResponseCache | None = None,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.pool_size = pool_size
+        # None: the limit already set for the host, or `pool_size` for a new one
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.verify = verify
+        self.cache = cache
+        self.session = self.build_session(
+            pool_size, max_retries, backoff_factor, backoff_jitter
+        )
+
+    def build_session(
+        self,
+        pool_size: int,
+        max_retries: int,
+        backoff_factor: float,
+        backoff_jitter: float,
+    ) -> requests.Session:
+        """Create a keep-alive Session retrying 5xx/429 with jittered backoff."""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            status_forcelist=self.retry_statuses,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def host_slots(self, host: str) -> threading.BoundedSemaphore:
+        """Return the semaphore limiting concurrent requests to `host`.
+
+        The first client to reach a host sets its limit; a client asking
+        explicitly for a different one raises ValueError instead of being
+        silently ignored.
+        """
+        with ApiClient._host_slots_lock:
+            if host not in ApiClient._host_slots:
+                limit = self.max_per_host or self.pool_size
+                ApiClient._host_slots[host] = (
+                    limit,
+                    threading.BoundedSemaphore(limit),
+                )
+            limit, slots = ApiClient._host_slots[host]
+            if self.max_per_host is not None and self.max_per_host != limit:
+                raise ValueError(
+                    f"{host} is limited to {limit} concurrent requests, "
+                    f"not {self.max_per_host}"
+                )
+            return slots
+
+    def build_url(self, url: str = "") -> str:
+        """Resolve `url` against `base_url` unless it is already absolute."""
+        if url.startswith(("http://", "https://")):
+            return url
+        if not url:
+            return self.base_url
+        return f"{self.base_url.rstrip('/')}/{url.lstrip('/')}"
+
+    def get(
+        self, url: str = "", params: dict | None = None, ttl: float | None = None
+    ) -> requests.Response:
+        """GET through the response cache and the pooled session.
+
+        `ttl` overrides, for this request only, the cache TTL of the URL.
+        """
+        url = self.build_url(url)
+        if self.cache is None:
+            return self.send(url, params)
+
+        entry = self.cache.lookup(url, params)
+        if entry is not None and (
+            self.cache.offline or self.cache.is_fresh(entry, ttl)
+        ):
+            return entry.to_response()
+        if self.cache.offline:
+            raise requests.ConnectionError(f"Offline mode: {url} is not cached")
+
+        resp = self.send(url, params, entry.validators() if entry else None)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.refresh(entry)
+            return entry.to_response()
+        if resp.status_code in self.cached_statuses:
+            self.cache.store(url, params, resp)
+        return resp
+
+    def send(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """GET through the pooled session, honouring the per-host limit."""
+        with self.host_slots(urlsplit(url).netloc):
+            return self.session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=self.timeout,
+                verify=self.verify,
+                stream=stream,
+            )
+
+    @contextmanager
+    def open_body(self, url: str = "", params: dict | None = None):
+        """Binary file-like body of a GET, without loading it into memory.
+
+        Cached bodies are read from disk; fresh downloads are streamed from
+        the socket, or spooled to the cache first when there is one.
+        """
+        url = self.build_url(url)
+        entry = self.cache.lookup(url, params) if self.cache is not None else None
+        if entry is not None and (self.cache.offline or self.cache.is_fresh(entry)):
+            with open(entry.body_path, "rb") as body:
+                yield body
+            return
+        if self.cache is not None and self.cache.offline:
+            raise requests.ConnectionError(f"Offline mode: {url} is not cached")
+
+        resp = self.send(url, params, entry.validators() if entry else None, True)
+        try:
+            if resp.status_code == 304 and entry is not None:
+                self.cache.refresh(entry)
+            else:
+                resp.raise_for_status()
+                if self.cache is None:
+                    resp.raw.decode_content = True
+                    yield resp.raw
+                    return
+                entry = self.cache.store(url, params, resp)
+        finally:
+            resp.close()
+        with open(entry.body_path, "rb") as body:
+            yield body
+
+    def fetch_json(
+        self, url: str = "", params: dict | None = None, ttl: float | None = None
+    ):
+        """Download JSON with error handling."""
+        resp = self.get(url, params, ttl)
+        resp.raise_for_status()
+        return loads(resp.content)
+
+    def fetch_frame(
+        self,
+        url: str = "",
+        params: dict | None = None,
+        fields: list | None = None,
+        chunk_size: int = 50_000,
+        normalize: bool = True,
+        meta: dict | None = None,
+    ) -> pd.DataFrame:
+        """Download a JSON list straight into a DataFrame, decoding it as a stream.
+
+        Only `fields` are kept when given; see `json_stream.records_to_frame`.
+        The top-level scalars of a page go to `meta`; see `json_stream.iter_records`.
+        """
+        with self.open_body(url, params) as body:
+            return read_records(body, fields, chunk_size, normalize, meta)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
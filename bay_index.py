@@ -0,0 +1,164 @@
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+SUBESTACION = "Subestación"
+PANO = "Paño"
+COINCIDENCIA = "Coincidencia"
+CONFIANZA = "Confianza"
+
+# Which CT is kept when a bay has several (SS/EE de interruptor y medio):
+# "first" / "last" in Infotécnica order, or "all" to keep every CT
+POLICIES = ("first", "last", "all")
+
+
+def split_bay_names(names: pd.Series) -> pd.DataFrame:
+    """Split normalized "S/E <subestación> <paño>" names into both parts."""
+    words = names.astype("string").str.split()
+    return pd.DataFrame(
+        {SUBESTACION: words.str[1:-1].str.join(" "), PANO: words.str[-1]},
+        index=names.index,
+    )
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class BayIndex:
+    """(subestación, paño) index over the Infotécnica current transformers.
+
+    Bays are looked up by exact key first. The remaining keys fall back to an
+    approximate match: candidate substations are blocked by shared trigrams,
+    only the best `candidates` are scored, and the bay is then matched within
+    the chosen substation. The confidence of a match is the product of the
+    substation and bay similarities (1.0 for exact matches); matches below
+    `min_confidence` are dropped.
+    """
+
+    def __init__(
+        self,
+        ttcc_df: pd.DataFrame,
+        name_column: str = "pano_nombre",
+        policy: str = "first",
+        min_confidence: float = 0.85,
+        candidates: int = 10,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Unknown CT policy '{policy}', expected one of {POLICIES}"
+            )
+        self.policy = policy
+        self.min_confidence = min_confidence
+        self.candidates = candidates
+
+        keys = split_bay_names(ttcc_df[name_column])
+        ttcc_df = pd.concat([keys, ttcc_df], axis=1).dropna(subset=[SUBESTACION, PANO])
+        if policy != "all":
+            ttcc_df = ttcc_df.drop_duplicates(subset=[SUBESTACION, PANO], keep=policy)
+        self.ttcc = ttcc_df.reset_index(drop=True)
+        self.keys = pd.MultiIndex.from_frame(self.ttcc[[SUBESTACION, PANO]]).unique()
+
+        # --- Blocking structures for the approximate fallback ---
+        self.bays = defaultdict(list)
+        for subestacion, pano in self.keys:
+            self.bays[subestacion].append(pano)
+        self.grams = defaultdict(list)
+        for subestacion in self.bays:
+            for gram in trigrams(subestacion):
+                self.grams[gram].append(subestacion)
+        self._approximate = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys
+
+    def lookup(self, subestacion: str, pano: str) -> tuple | None:
+        """Best (subestación, paño, confidence) for a bay, or None."""
+        if (subestacion, pano) in self.keys:
+            return subestacion, pano, 1.0
+        if (subestacion, pano) not in self._approximate:
+            self._approximate[subestacion, pano] = self._match(subestacion, pano)
+        return self._approximate[subestacion, pano]
+
+    def _match(self, subestacion: str, pano: str) -> tuple | None:
+        if subestacion in self.bays:
+            shortlist = [subestacion]
+        else:
+            shared = Counter(
+                candidate
+                for gram in trigrams(subestacion)
+                for candidate in self.grams.get(gram, ())
+            )
+            shortlist = [
+                candidate for candidate, _ in shared.most_common(self.candidates)
+            ]
+
+        best = None
+        for candidate in shortlist:
+            score = similarity(subestacion, candidate)
+            if pano in self.bays[candidate]:
+                match = (candidate, pano, score)
+            else:
+                bay = max(self.bays[candidate], key=lambda b: similarity(pano, b))
+                match = (candidate, bay, score * similarity(pano, bay))
+            if best is None or match[2] > best[2]:
+                best = match
+        if best is None or best[2] < self.min_confidence:
+            return None
+        return best
+
+    def match(
+        self,
+        df: pd.DataFrame,
+        subestacion_column: str = SUBESTACION,
+        pano_column: str = PANO,
+    ) -> pd.DataFrame:
+        """Left-join the CTs of every (subestación, paño) of `df`.
+
+        Adds "Coincidencia" ("exacta", "aproximada" or missing) and
+        "Confianza" columns, plus the matched "Subestación_IT"/"Paño_IT".
+        """
+        query = df[[subestacion_column, pano_column]].astype("string")
+        query = query.reset_index(drop=True)
+        exact = pd.MultiIndex.from_frame(query).isin(self.keys)
+        matched_sub = query[subestacion_column].where(exact).astype(object)
+        matched_pano = query[pano_column].where(exact).astype(object)
+        confianza = np.where(exact, 1.0, np.nan)
+
+        # Approximate fallback for the misses, memoized per distinct key
+        missing = ~exact & query.notna().all(axis=1).to_numpy()
+        for row in np.flatnonzero(missing):
+            found = self.lookup(*query.iloc[row])
+            if found is not None:
+                matched_sub[row], matched_pano[row], confianza[row] = found
+
+        result = df.reset_index(drop=True).assign(
+            **{
+                COINCIDENCIA: pd.Series(
+                    np.select(
+                        [exact, ~np.isnan(confianza)], ["exacta", "aproximada"], None
+                    ),
+                    dtype="string",
+                ),
+                CONFIANZA: confianza,
+                f"{SUBESTACION}_IT": matched_sub.astype("string"),
+                f"{PANO}_IT": matched_pano.astype("string"),
+            }
+        )
+        return result.merge(
+            self.ttcc.rename(
+                columns={SUBESTACION: f"{SUBESTACION}_IT", PANO: f"{PANO}_IT"}
+            ),
+            on=[f"{SUBESTACION}_IT", f"{PANO}_IT"],
+            how="left",
+        )
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+
+class CheckpointStore:
+    """Columnar checkpoints of intermediate DataFrames between pipeline stages.
+
+    Frames are stored as Feather (default, uncompressed so reads can be
+    memory-mapped) or Parquet, keeping dtypes and index. Without pyarrow, or
+    for frames Arrow cannot represent, a pickle is written instead. Excel is
+    left for the final, human-facing deliverables.
+    """
+
+    suffixes = {"feather": ".feather", "parquet": ".parquet", "pickle": ".pkl"}
+
+    def __init__(self, folder: Path = Path("cache/checkpoints"), format="feather"):
+        if format not in self.suffixes:
+            raise ValueError(f"Unknown checkpoint format '{format}'")
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.format = format if pa is not None else "pickle"
+
+    def path(self, name: str) -> Path | None:
+        """Path of the stored checkpoint `name`, whatever its format."""
+        for suffix in self.suffixes.values():
+            path = self.folder / f"{name}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def exists(self, name: str) -> bool:
+        return self.path(name) is not None
+
+    def save(self, name: str, df: pd.DataFrame) -> Path:
+        """Store `df` as checkpoint `name`, replacing any previous version."""
+        path = self.folder / f"{name}{self.suffixes[self.format]}"
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            self._write(tmp_path, df, self.format)
+        except Exception as e:
+            if pa is None or not isinstance(e, pa.ArrowException):
+                raise
+            path = self.folder / f"{name}{self.suffixes['pickle']}"
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            self._write(tmp_path, df, "pickle")
+
+        self.delete(name)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, name: str, columns: list | None = None) -> pd.DataFrame:
+        """Read checkpoint `name` back, memory-mapping Arrow files."""
+        path = self.path(name)
+        if path is None:
+            raise FileNotFoundError(f"No checkpoint named '{name}' in {self.folder}")
+
+        if path.suffix == ".feather":
+            table = feather.read_table(path, columns=columns, memory_map=True)
+            return table.to_pandas()
+        if path.suffix == ".parquet":
+            return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+        df = pd.read_pickle(path)
+        return df[columns] if columns is not None else df
+
+    def delete(self, name: str):
+        for suffix in self.suffixes.values():
+            (self.folder / f"{name}{suffix}").unlink(missing_ok=True)
+
+    def read_excel(self, file_path: Path, **kwargs) -> pd.DataFrame:
+        """`pd.read_excel` that parses each workbook version only once.
+
+        The parsed frame is checkpointed under a key made of the file path,
+        size, modification time and read arguments; later calls load it
+        back instead of parsing the xlsx again.
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        key = hashlib.sha256(
+            json.dumps(
+                [str(file_path.resolve()), stat.st_size, stat.st_mtime_ns, kwargs],
+                default=str,
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()[:16]
+        name = f"xlsx_{file_path.stem}_{key}"
+
+        if self.exists(name):
+            return self.load(name)
+        df = pd.read_excel(file_path, **kwargs)
+        self.save(name, df)
+        return df
+
+    def _write(self, path: Path, df: pd.DataFrame, format: str):
+        if format == "pickle":
+            with open(path, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            return
+
+        table = pa.Table.from_pandas(df, preserve_index=None)
+        if format == "feather":
+            feather.write_feather(table, path, compression="uncompressed")
+        else:
+            pq.write_table(table, path)
+
+
+def write_frame(df: pd.DataFrame, path: Path) -> Path:
+    """Save `df` to `path` in the columnar format given by its suffix."""
+    path = Path(path)
+    if path.suffix == ".feather":
+        feather.write_feather(
+            pa.Table.from_pandas(df, preserve_index=None),
+            path,
+            compression="uncompressed",
+        )
+    elif path.suffix == ".parquet":
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=None), path)
+    elif path.suffix == ".pkl":
+        df.to_pickle(path)
+    else:
+        raise ValueError(f"Unsupported snapshot format '{path.suffix}'")
+    return path
+
+
+def read_frame(path: Path, columns: list | None = None) -> pd.DataFrame:
+    """Read a frame from Feather, Parquet, pickle or Excel, by file suffix."""
+    path = Path(path)
+    if path.suffix == ".feather":
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if path.suffix == ".parquet":
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if path.suffix == ".pkl":
+        df = pd.read_pickle(path)
+        return df[columns] if columns is not None else df
+    return pd.read_excel(path, usecols=columns)
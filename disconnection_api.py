@@ -0,0 +1,110 @@
+from datetime import datetime
+
+import pandas as pd
+from neomante_api import DATE_OPERATORS, NeomanteApiClient
+from schemas import INTERVENCIONES_DESCONEXION, Schema
+
+# Server-side filters of `/v2`: field -> operator suffixes it accepts ("" is
+# equality), as listed in reuc_api_example_files/intervencion-desconexion.json.
+DISCONNECTION_DATE_OPERATORS = ("Exists", *DATE_OPERATORS, "Exact")
+FILTERS = {
+    "id": ("", "In", "Ne"),
+    "correlativo": ("", "In"),
+    "fechaInicioLocal": DISCONNECTION_DATE_OPERATORS,
+    "fechaFinLocal": DISCONNECTION_DATE_OPERATORS,
+    "fechaEfectivaInicioLocal": DISCONNECTION_DATE_OPERATORS,
+    "fechaEfectivaFinLocal": DISCONNECTION_DATE_OPERATORS,
+    "status": ("", "In", "Ne"),
+    "tipoSolicitud": ("", "In", "Ne"),
+    "tipoProgramacion": ("", "In", "Ne"),
+    "idEmpresa": ("", "In"),
+    "tipo": ("", "In"),
+    "idCentral": ("", "In"),
+    "idSubestacion": ("", "In"),
+    "idLinea": ("", "In"),
+    "elementoATrabajar": ("", "In"),
+    "idTipoTrabajo": ("", "In", "Ne"),
+    "consumo": ("", "In", "Ne"),
+    "created": ("Lt", "Lte", "Gt", "Gte"),
+    "docEstadoOperativo": ("", "In"),
+    "idCentralTipo": ("", "In"),
+    "comentario": ("", "Exists"),
+    "trabajoRelevante": ("",),
+    "ordering": ("",),
+}
+
+
+class DisconnectionApiClient(NeomanteApiClient):
+    """Client for the Neomante intervention-disconnection API (`/v2`)."""
+
+    service = "intervencion-desconexion"
+    filters = FILTERS
+    schema = INTERVENCIONES_DESCONEXION
+
+    def get_disconnections(
+        self,
+        page_size: int = 500,
+        max_workers: int | None = None,
+        schema: Schema | None = None,
+        **filters,
+    ) -> pd.DataFrame:
+        """Interventions and disconnections matching `filters`, typed by `schema`.
+
+        The filters are applied by the server (see `filter_params`), e.g.
+        `get_disconnections(id_central_in=[1, 2], fecha_fin_local_gte=today)`.
+        """
+        return self.get_records(page_size, max_workers, schema, **filters)
+
+    def get_unit_disconnections(
+        self,
+        units_df: pd.DataFrame,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        plant_column: str = "PlantID",
+        batch_size: int = 200,
+        **filters,
+    ) -> pd.DataFrame:
+        """Disconnections of the centrales of `units_df` overlapping [start, end].
+
+        Only those centrales are requested (`idCentralIn`, `batch_size` ids per
+        query to keep URLs short), and only interventions ending after `start`
+        and starting before `end`. Each one is joined to the units of its
+        central.
+        """
+        plant_ids = units_df[plant_column].dropna().astype("int64").unique()
+        frames = [
+            self.get_disconnections(
+                id_central_in=plant_ids[i : i + batch_size],
+                fecha_fin_local_gte=start,
+                fecha_inicio_local_lte=end,
+                **filters,
+            )
+            for i in range(0, len(plant_ids), batch_size)
+        ]
+        if frames:
+            disconnections_df = pd.concat(frames, ignore_index=True)
+        else:
+            disconnections_df = self.schema.apply(pd.DataFrame())
+        disconnections_df = disconnections_df.drop_duplicates(subset="id")
+
+        return units_df.merge(
+            disconnections_df,
+            left_on=plant_column,
+            right_on="idCentral",
+            how="inner",
+        )
+
+
+if __name__ == "__main__":
+    import api_key
+    from main import pipeline
+
+    distr_units_df = pipeline.run(["distr_units"])["distr_units"]
+    client = DisconnectionApiClient(api_key=api_key.reuc_api_key)
+    data = client.get_unit_disconnections(distr_units_df, start=datetime.now())
+
+    data.to_excel(
+        f"output/pmgd_disconnections at "
+        f"{datetime.now().strftime('%Y-%m-%d %H.%M.%S')}.xlsx",
+        index=False,
+    )
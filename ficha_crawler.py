@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from api_client import ApiClient
+from ficha_snapshots import FichaSnapshotStore, long_fichas, pivot_fichas
+
+
+class RateLimiter:
+    """Spread request starts so that at most `rate` begin per second."""
+
+    def __init__(self, rate: float | None):
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class FichaCrawler:
+    """Bulk crawler for `/{resource}/{id}/fichas-tecnicas/{slug}/` over many IDs.
+
+    Requests are scheduled by asyncio with bounded concurrency and an optional
+    rate limit, and go through the pooled session of `client`, whose urllib3
+    Retry is the only retry layer. IDs that still fail are reported with the
+    number of attempts made, not dropped.
+    """
+
+    def __init__(
+        self,
+        client: ApiClient,
+        max_concurrency: int = 40,
+        rate_limit: float | None = None,
+    ):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+
+    def ficha_url(self, resource: str, id, ficha_type: str) -> str:
+        return f"{resource.strip('/')}/{id}/fichas-tecnicas/{ficha_type}/"
+
+    def attempts(self, url: str, resp: requests.Response | None = None) -> int:
+        """Requests made for `url`, read from the urllib3 retry history.
+
+        Without a response the session gave up: every retry was used.
+        """
+        if resp is None:
+            adapter = self.client.session.get_adapter(self.client.build_url(url))
+            return adapter.max_retries.total + 1
+        retries = getattr(resp.raw, "retries", None)
+        return len(retries.history) + 1 if retries is not None else 1
+
+    async def fetch_one(self, resource, id, ficha_type, semaphore, limiter, executor):
+        """Fetch one ficha, returning (id, data, failure)."""
+        loop = asyncio.get_running_loop()
+        url = self.ficha_url(resource, id, ficha_type)
+
+        async with semaphore:
+            await limiter.wait()
+            try:
+                resp = await loop.run_in_executor(executor, self.client.get, url)
+            except requests.RequestException as e:
+                status, error, attempts = None, str(e), self.attempts(url)
+            else:
+                status, error = resp.status_code, resp.reason
+                attempts = self.attempts(url, resp)
+                if status == 200:
+                    try:
+                        return id, resp.json(), None
+                    except ValueError as e:
+                        error = str(e)
+
+        return (
+            id,
+            None,
+            {"id": id, "status": status, "error": error, "attempts": attempts},
+        )
+
+    async def crawl_async(self, resource: str, ids_list: list, ficha_type: str):
+        """Fetch `ficha_type` for every ID; see `crawl`."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = RateLimiter(self.rate_limit)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = await asyncio.gather(
+                *(
+                    self.fetch_one(
+                        resource, id, ficha_type, semaphore, limiter, executor
+                    )
+                    for id in dict.fromkeys(ids_list)
+                )
+            )
+
+        fichas = {id: data for id, data, _ in results if data is not None}
+        failures = pd.DataFrame(
+            [failure for _, _, failure in results if failure is not None],
+            columns=["id", "status", "error", "attempts"],
+        )
+        return fichas, failures
+
+    def crawl(
+        self, resource: str, ids_list: list, ficha_type: str
+    ) -> tuple[dict, pd.DataFrame]:
+        """Fetch `ficha_type` for every ID.
+
+        Returns:
+        - fichas: Dictionary mapping each fetched ID to its raw ficha.
+        - failures: DataFrame with id, status, error and attempts of the IDs
+          that could not be fetched.
+        """
+        start_time = time.time()
+        fichas, failures = run_sync(self.crawl_async(resource, ids_list, ficha_type))
+        print(
+            f"{resource} {ficha_type}: {len(fichas)} fichas, "
+            f"{len(failures)} failures in {time.time() - start_time:.2f} s"
+        )
+        return fichas, failures
+
+    def sync(
+        self,
+        resource: str,
+        ids_list: list,
+        ficha_type: str,
+        store: FichaSnapshotStore,
+        fingerprints: pd.Series | None = None,
+    ) -> pd.DataFrame:
+        """Bring `store` up to date for `ids_list`, returning the failures.
+
+        `ids_list` is every ID of the list endpoint: entries of other IDs,
+        deleted in Infotécnica, are pruned from the snapshot.
+        """
+        store.prune(resource, ficha_type, ids_list)
+        stale_ids = store.stale_ids(resource, ficha_type, ids_list, fingerprints)
+        print(
+            f"{resource} {ficha_type}: {len(stale_ids)} of {len(ids_list)} "
+            "fichas to refresh"
+        )
+        fichas, failures = self.crawl(resource, stale_ids, ficha_type)
+        store.update(resource, ficha_type, fichas, fingerprints)
+        return failures
+
+    def fetch_categories(
+        self,
+        resource: str,
+        ids_list: list,
+        categories_list: list,
+        ficha_type: str,
+        column_map: dict | None = None,
+        store: FichaSnapshotStore | None = None,
+        fingerprints: pd.Series | None = None,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Crawl a ficha and keep `valor_texto` of `categories_list`, one row per ID.
+
+        With a `store`, only new or changed IDs are crawled (see `sync`) and the
+        categories are projected from its long-format values, which hold every
+        category: other categories can later be read with `store.pivot`.
+        """
+        if store is None:
+            fichas, failures = self.crawl(resource, ids_list, ficha_type)
+            values_df = long_fichas(fichas, ficha_type)
+        else:
+            failures = self.sync(resource, ids_list, ficha_type, store, fingerprints)
+            values_df = store.values(resource, ficha_type)
+        df = pivot_fichas(values_df, categories_list, ids_list, column_map)
+        return df, failures
+
+
+def run_sync(coro):
+    """Run `coro` to completion, also from inside a running loop (notebooks)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
@@ -0,0 +1,225 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+from checkpoints import pa, read_frame, write_frame
+from line_capacity import parse_decimal
+
+# Long format of ficha values: one row per (id, slug, category)
+VALUE_COLUMNS = ["id", "slug", "category", "valor_texto"]
+
+
+def list_fingerprints(list_df: pd.DataFrame, id_column: str = "id") -> pd.Series:
+    """Hash every row of a list endpoint frame, indexed by its ID.
+
+    A changed fingerprint means the list endpoint reports a change for that
+    ID, so its fichas are crawled again on the next refresh.
+    """
+    hashes = pd.util.hash_pandas_object(
+        list_df.astype(str), index=False, categorize=False
+    )
+    return pd.Series(hashes.astype(str).to_numpy(), index=list_df[id_column])
+
+
+def long_fichas(fichas: dict, slug: str) -> pd.DataFrame:
+    """Every `valor_texto` of `fichas` ({id: ficha}) in long format.
+
+    IDs are kept as text, as in the snapshot files; slug and category are
+    categoricals, so the table stays compact.
+    """
+    rows = [
+        (str(id), category, value.get("valor_texto"))
+        for id, data in fichas.items()
+        for category, value in data.items()
+        if isinstance(value, dict)
+    ]
+    df = pd.DataFrame(rows, columns=["id", "category", "valor_texto"])
+    return pd.DataFrame(
+        {
+            "id": df["id"].astype("string"),
+            "slug": pd.Categorical([slug] * len(df)),
+            "category": df["category"].astype("category"),
+            "valor_texto": df["valor_texto"].astype("string"),
+        },
+        columns=VALUE_COLUMNS,
+    )
+
+
+def pivot_fichas(
+    values_df: pd.DataFrame,
+    categories: list,
+    ids_list: list | None = None,
+    column_map: dict | None = None,
+    dtypes: dict | None = None,
+) -> pd.DataFrame:
+    """Project long ficha values to one row per ID and one column per category.
+
+    Args:
+    - values_df: Long ficha values (see `long_fichas`) of a single slug.
+    - categories: Category IDs to keep, in column order. Missing ones are NA.
+    - ids_list: IDs to keep, in row order; IDs without a ficha are left out.
+      Defaults to every ID of `values_df`.
+    - column_map: Dictionary to rename columns.
+    - dtypes: Type of the (renamed) columns: "float" for decimal-comma
+      numbers, "int", "datetime" (day first), or any pandas dtype.
+    """
+    categories = [str(category) for category in categories]
+    selected = values_df[values_df["category"].isin(categories)]
+    wide = selected.pivot(index="id", columns="category", values="valor_texto")
+    wide = wide.reindex(columns=categories).astype("string")
+    wide.columns = list(categories)
+
+    present = values_df["id"].unique()
+    if ids_list is None:
+        ids_list = list(present)
+    ids = pd.Index(list(dict.fromkeys(ids_list)))
+    ids = ids[ids.astype(str).isin(present)]
+    df = wide.reindex(ids.astype(str)).reset_index(drop=True)
+    df.insert(0, "id", ids)
+
+    if column_map:
+        df = df.rename(columns=column_map)
+    for column, dtype in (dtypes or {}).items():
+        if dtype == "float":
+            df[column] = parse_decimal(df[[column]])[:, 0]
+        elif dtype == "int":
+            df[column] = pd.array(parse_decimal(df[[column]])[:, 0]).astype("Int64")
+        elif dtype == "datetime":
+            df[column] = pd.to_datetime(df[column], dayfirst=True, errors="coerce")
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+class FichaSnapshotStore:
+    """Local snapshot of fichas técnicas keyed by (resource, id, ficha slug).
+
+    Every entry records when it was fetched, the list fingerprint of its ID at
+    that time and the ficha itself. `stale_ids` selects the IDs that are new,
+    whose fingerprint changed, or, when no fingerprints are given, whose entry
+    is older than `ttl` seconds.
+
+    Next to every snapshot, all its category values are kept in a columnar,
+    long-format table, so any set of categories can be projected with `pivot`
+    without crawling again.
+    """
+
+    def __init__(self, folder: Path = Path("cache/fichas"), ttl: float = 30 * 86400):
+        self.folder = Path(folder)
+        self.ttl = ttl
+
+    def path(self, resource: str, ficha_type: str) -> Path:
+        return self.folder / resource.strip("/") / f"{ficha_type}.json"
+
+    def load(self, resource: str, ficha_type: str) -> dict:
+        path = self.path(resource, ficha_type)
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def values_path(self, resource: str, ficha_type: str) -> Path:
+        suffix = ".feather" if pa is not None else ".pkl"
+        return self.path(resource, ficha_type).with_suffix(suffix)
+
+    def save(self, resource: str, ficha_type: str, entries: dict):
+        path = self.path(resource, ficha_type)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+        self.save_values(resource, ficha_type, entries)
+
+    def save_values(self, resource: str, ficha_type: str, entries: dict):
+        values_df = long_fichas(
+            {id: entry["data"] for id, entry in entries.items()}, ficha_type
+        )
+        write_frame(values_df, self.values_path(resource, ficha_type))
+        return values_df
+
+    def values(self, resource: str, ficha_type: str) -> pd.DataFrame:
+        """Long-format values (id, slug, category, valor_texto) of a snapshot.
+
+        Snapshots written before the values table existed are converted once.
+        """
+        values_path = self.values_path(resource, ficha_type)
+        if values_path.exists():
+            return read_frame(values_path)
+        if not self.path(resource, ficha_type).exists():
+            return long_fichas({}, ficha_type)
+        return self.save_values(resource, ficha_type, self.load(resource, ficha_type))
+
+    def pivot(
+        self,
+        resource: str,
+        ficha_type: str,
+        categories: list,
+        ids_list: list | None = None,
+        column_map: dict | None = None,
+        dtypes: dict | None = None,
+    ) -> pd.DataFrame:
+        """Stored categories of `ids_list`, one row per ID; see `pivot_fichas`."""
+        return pivot_fichas(
+            self.values(resource, ficha_type),
+            categories,
+            ids_list,
+            column_map,
+            dtypes,
+        )
+
+    def stale_ids(
+        self,
+        resource: str,
+        ficha_type: str,
+        ids_list: list,
+        fingerprints: pd.Series | None = None,
+    ) -> list:
+        """IDs of `ids_list` whose ficha has to be crawled again."""
+        entries = self.load(resource, ficha_type)
+        now = time.time()
+        stale = []
+        for id in ids_list:
+            entry = entries.get(str(id))
+            if entry is None:
+                stale.append(id)
+            elif fingerprints is not None and id in fingerprints.index:
+                if entry.get("fingerprint") != fingerprints[id]:
+                    stale.append(id)
+            elif now - entry["fetched_at"] > self.ttl:
+                stale.append(id)
+        return stale
+
+    def update(
+        self,
+        resource: str,
+        ficha_type: str,
+        fichas: dict,
+        fingerprints: pd.Series | None = None,
+    ):
+        """Record freshly fetched fichas."""
+        entries = self.load(resource, ficha_type)
+        now = time.time()
+        for id, data in fichas.items():
+            fingerprint = None
+            if fingerprints is not None and id in fingerprints.index:
+                fingerprint = fingerprints[id]
+            entries[str(id)] = {
+                "fetched_at": now,
+                "fingerprint": fingerprint,
+                "data": data,
+            }
+        self.save(resource, ficha_type, entries)
+
+    def fichas(self, resource: str, ficha_type: str, ids_list: list) -> dict:
+        """Stored fichas of `ids_list`, keyed by the IDs as given."""
+        entries = self.load(resource, ficha_type)
+        return {id: entries[str(id)]["data"] for id in ids_list if str(id) in entries}
+
+    def prune(self, resource: str, ficha_type: str, ids_list: list):
+        """Drop entries of IDs that no longer exist in the list endpoint."""
+        keep = {str(id) for id in ids_list}
+        entries = self.load(resource, ficha_type)
+        kept = {id: entry for id, entry in entries.items() if id in keep}
+        if len(kept) < len(entries):
+            self.save(resource, ficha_type, kept)
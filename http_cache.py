@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    body_path: Path
+    meta: dict
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.meta["stored_at"]
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.meta.get("last_modified"):
+            headers["If-Modified-Since"] = self.meta["last_modified"]
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a `requests.Response` from the cached body."""
+        resp = requests.Response()
+        resp.status_code = self.meta.get("status", 200)
+        resp.reason = self.meta.get("reason", "OK")
+        resp.url = self.meta["url"]
+        resp.encoding = self.meta.get("encoding") or "utf-8"
+        resp.headers.update(self.meta.get("headers", {}))
+        resp._content = self.body_path.read_bytes()
+        return resp
+
+
+class ResponseCache:
+    """Disk-backed cache of successful GET responses, keyed by URL and params.
+
+    Entries are fresh for a TTL chosen per endpoint (the longest pattern of
+    `ttls` found in the URL, otherwise `default_ttl`). Stale entries are
+    revalidated with ETag/Last-Modified when the server sent them. The folder
+    is kept under `max_bytes` by evicting the least recently used entries.
+    In `offline` mode cached entries are served regardless of age and misses
+    raise instead of reaching the network.
+    """
+
+    # Params never written to the cache metadata.
+    secret_params = ("user_key",)
+
+    def __init__(
+        self,
+        folder: Path = Path("cache/http"),
+        default_ttl: float = 12 * 3600,
+        ttls: dict[str, float] | None = None,
+        max_bytes: int = 1024**3,
+        offline: bool = False,
+    ):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.size = sum(p.stat().st_size for p in self.folder.glob("*.body"))
+
+    def key(self, url: str, params: dict | None = None) -> str:
+        payload = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        matches = [pattern for pattern in self.ttls if pattern in url]
+        if not matches:
+            return self.default_ttl
+        return self.ttls[max(matches, key=len)]
+
+    def lookup(self, url: str, params: dict | None = None) -> CacheEntry | None:
+        key = self.key(url, params)
+        body_path = self.folder / f"{key}.body"
+        meta_path = self.folder / f"{key}.meta.json"
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            os.utime(body_path)  # Mark as recently used for LRU eviction.
+        except (FileNotFoundError, ValueError):
+            return None
+        return CacheEntry(key, body_path, meta)
+
+    def is_fresh(self, entry: CacheEntry, ttl: float | None = None) -> bool:
+        """Whether `entry` is younger than `ttl`, by default that of its URL."""
+        if ttl is None:
+            ttl = self.ttl_for(entry.meta["url"])
+        return entry.age < ttl
+
+    def store(
+        self, url: str, params: dict | None, resp: requests.Response
+    ) -> CacheEntry:
+        key = self.key(url, params)
+        body_path = self.folder / f"{key}.body"
+        meta = {
+            "url": url,
+            "params": {
+                k: v for k, v in (params or {}).items() if k not in self.secret_params
+            },
+            "stored_at": time.time(),
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "encoding": resp.encoding,
+            "headers": {"Content-Type": resp.headers.get("Content-Type", "")},
+        }
+
+        old_size = body_path.stat().st_size if body_path.exists() else 0
+        # Streamed responses are spooled to disk chunk by chunk.
+        self._write(body_path, resp.iter_content(chunk_size=1024**2))
+        self._write(self.folder / f"{key}.meta.json", json.dumps(meta).encode())
+
+        with self.lock:
+            self.size += body_path.stat().st_size - old_size
+        if self.size > self.max_bytes:
+            self.evict()
+        return CacheEntry(key, body_path, meta)
+
+    def refresh(self, entry: CacheEntry):
+        """Restart the TTL of an entry the server confirmed as unchanged (304)."""
+        entry.meta["stored_at"] = time.time()
+        self._write(
+            self.folder / f"{entry.key}.meta.json", json.dumps(entry.meta).encode()
+        )
+
+    def evict(self):
+        """Delete least recently used entries until the folder fits `max_bytes`."""
+        with self.lock:
+            bodies = sorted(self.folder.glob("*.body"), key=lambda p: p.stat().st_mtime)
+            target = self.max_bytes * 0.9
+            for body_path in bodies:
+                if self.size <= target:
+                    break
+                self.size -= body_path.stat().st_size
+                body_path.unlink(missing_ok=True)
+                (self.folder / f"{body_path.stem}.meta.json").unlink(missing_ok=True)
+
+    def clear(self):
+        with self.lock:
+            for path in self.folder.iterdir():
+                path.unlink(missing_ok=True)
+            self.size = 0
+
+    def _write(self, path: Path, data: bytes | Iterable[bytes]):
+        # Write then rename, so concurrent readers never see partial files.
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+        os.replace(tmp_path, path)
@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from api_client import ApiClient
+from ficha_crawler import FichaCrawler
+from ficha_snapshots import FichaSnapshotStore
+
+
+class InfotecnicaClient(ApiClient):
+    """Client for api-infotecnica lists and fichas técnicas."""
+
+    def __init__(
+        self,
+        base_url: str = "https://api-infotecnica.coordinador.cl/v1",
+        pool_size: int = 60,
+        **kwargs,
+    ):
+        super().__init__(base_url, pool_size=pool_size, **kwargs)
+
+    def get_data(self, resource: str, fields: list | None = None) -> pd.DataFrame:
+        """Download a whole `/v1/<resource>` list into a DataFrame.
+
+        The response is decoded as a stream; pass `fields` to keep only those.
+        """
+        return self.fetch_frame(resource, fields=fields, normalize=False)
+
+    def count_pages(self, count, first_page_size: int) -> int:
+        """Number of pages of a list of `count` records.
+
+        Pages are counted with the number of results the server actually
+        returned in the first page, which may be less than the requested size.
+        """
+        if first_page_size == 0:
+            return 1
+        return max(1, -(-int(count or 0) // first_page_size))
+
+    def fetch_page_frame(
+        self,
+        resource: str,
+        page: int,
+        page_size: int = 1000,
+        fields=None,
+        meta: dict | None = None,
+    ) -> pd.DataFrame:
+        """One page of `/v1/<resource>` as a DataFrame, decoded as a stream.
+
+        The `count` and other top-level scalars of the page go to `meta`.
+        """
+        return self.fetch_frame(
+            resource, {"page": page, "page_size": page_size}, fields, meta=meta
+        )
+
+    def get_data_by_pages(
+        self,
+        resource: str,
+        page_size: int = 1000,
+        max_workers: int | None = None,
+        fields: list | None = None,
+    ) -> pd.DataFrame:
+        """Download a long `/v1/<resource>` list page by page into one DataFrame.
+
+        Every page is turned into columns (only `fields`, when given) as soon
+        as it arrives, so the records of the whole list are never held at once.
+        """
+        frames = list(self.iter_pages(resource, page_size, max_workers, fields))
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def iter_pages(
+        self,
+        resource: str,
+        page_size: int = 1000,
+        max_workers: int | None = None,
+        fields: list | None = None,
+    ):
+        """Yield one DataFrame per page of `/v1/<resource>`, in page order.
+
+        Pages after the first are requested concurrently, so later pages are
+        usually already downloaded when the consumer asks for them.
+        """
+        # The first page is streamed like the others; its `count` is kept in
+        # `meta`, which stays empty for resources served as a plain list.
+        meta = {}
+        first = self.fetch_page_frame(resource, 1, page_size, fields, meta)
+        yield first
+        n_pages = self.count_pages(meta.get("count"), len(first))
+        if n_pages == 1:
+            return
+
+        workers = min(max_workers or self.pool_size, n_pages - 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(
+                lambda page: self.fetch_page_frame(resource, page, page_size, fields),
+                range(2, n_pages + 1),
+            )
+
+    def fetch_fichas(
+        self,
+        resource: str,
+        ids_list: list,
+        categories_list: list,
+        ficha_type: str,
+        column_map: dict | None = None,
+        max_workers: int | None = None,
+        rate_limit: float | None = None,
+        store: FichaSnapshotStore | None = None,
+        fingerprints: pd.Series | None = None,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Fetch the same ficha for many IDs concurrently over the pooled session.
+
+        Args:
+        - resource: Infotécnica resource, e.g. "secciones-tramos".
+        - ids_list: List of IDs for data fetching.
+        - categories_list: List of categories to fetch.
+        - ficha_type: Type of ficha to fetch.
+        - column_map: Dictionary to rename columns.
+        - max_workers: Maximum concurrent requests. Defaults to the pool size.
+        - rate_limit: Maximum requests started per second. Default is no limit.
+        - store: Snapshot store; when given, only new or changed IDs are crawled.
+        - fingerprints: List-row fingerprints by ID (see `list_fingerprints`),
+          used to detect changed IDs. Without them the store TTL applies.
+
+        Returns:
+        - df: DataFrame containing fetched data for each ID.
+        - failures: DataFrame with the IDs that could not be fetched.
+        """
+        crawler = FichaCrawler(
+            self, max_concurrency=max_workers or self.pool_size, rate_limit=rate_limit
+        )
+        return crawler.fetch_categories(
+            resource,
+            ids_list,
+            categories_list,
+            ficha_type,
+            column_map,
+            store,
+            fingerprints,
+        )
@@ -0,0 +1,162 @@
+import json
+from itertools import islice
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None
+
+# UTF-8 BOM and whitespace allowed before the JSON document
+LEADING_BYTES = b"\xef\xbb\xbf \t\r\n"
+
+# ijson events of scalar values
+SCALAR_EVENTS = ("null", "boolean", "integer", "double", "number", "string")
+
+
+def loads(data: bytes):
+    """Decode a JSON document, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def iter_records(stream, meta: dict | None = None):
+    """Yield the records of a JSON list, or of the `results` of a page.
+
+    With ijson installed the binary `stream` is parsed incrementally, so only
+    the current record is held in memory; otherwise the document is decoded
+    at once. When `meta` is given, the other top-level scalars of a page
+    (e.g. its `count`) are stored in it as they are read.
+    """
+    if ijson is None:
+        data = loads(stream.read())
+        if isinstance(data, dict):
+            if meta is not None:
+                meta.update(
+                    (key, value)
+                    for key, value in data.items()
+                    if not isinstance(value, (dict, list))
+                )
+            data = data.get("results") or []
+        yield from data
+        return
+
+    # The first significant byte tells a list from a page object.
+    head = b""
+    while not head.lstrip(LEADING_BYTES):
+        chunk = stream.read(64)
+        if not chunk:
+            return
+        head += chunk
+    head = head.lstrip(LEADING_BYTES)
+    prefix = "results.item" if head.startswith(b"{") else "item"
+    if meta is None or prefix == "item":
+        yield from ijson.items(Prepended(head, stream), prefix, use_float=True)
+    else:
+        yield from iter_page_items(Prepended(head, stream), meta)
+
+
+def iter_page_items(stream, meta: dict):
+    """Yield the `results` of a page object, storing its top-level scalars in `meta`.
+
+    Slower than `ijson.items`, since every parser event goes through Python,
+    but still holds only the current record in memory.
+    """
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == "results.item" and event in ("end_map", "end_array"):
+                yield builder.value
+                builder = None
+        elif prefix == "results.item":
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            else:
+                yield value
+        elif prefix and "." not in prefix and event in SCALAR_EVENTS:
+            meta[prefix] = value
+
+
+class Prepended:
+    """Binary stream that returns `head` before the rest of `stream`."""
+
+    def __init__(self, head: bytes, stream):
+        self.head = head
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self.head:
+            return self.stream.read(size)
+        if size is None or size < 0:
+            data, self.head = self.head + self.stream.read(), b""
+        else:
+            data, self.head = self.head[:size], self.head[size:]
+        return data
+
+
+def project(record: dict, fields: list) -> list:
+    """Values of `fields` in `record`; "a.b" reads nested objects."""
+    values = []
+    for field in fields:
+        value = record
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        values.append(value)
+    return values
+
+
+def records_to_frame(
+    records,
+    fields: list | None = None,
+    chunk_size: int = 50_000,
+    normalize: bool = True,
+) -> pd.DataFrame:
+    """Build a DataFrame from an iterable of records, `chunk_size` at a time.
+
+    Only `fields` are kept when given (nested ones as "a.b", as named by
+    `pd.json_normalize`); otherwise every field, flattened with
+    `pd.json_normalize` unless `normalize` is False. Each chunk of records is
+    turned into columns before the next one is read.
+    """
+    records = iter(records)
+    chunks = []
+    while chunk := list(islice(records, chunk_size)):
+        if fields is not None:
+            chunks.append(
+                pd.DataFrame(
+                    [project(record, fields) for record in chunk], columns=fields
+                )
+            )
+        elif normalize:
+            chunks.append(pd.json_normalize(chunk))
+        else:
+            chunks.append(pd.DataFrame(chunk))
+
+    if not chunks:
+        return pd.DataFrame(columns=fields)
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_records(
+    stream,
+    fields: list | None = None,
+    chunk_size: int = 50_000,
+    normalize: bool = True,
+    meta: dict | None = None,
+) -> pd.DataFrame:
+    """Stream a JSON list from a binary file-like object into a DataFrame.
+
+    See `iter_records` for `meta`.
+    """
+    return records_to_frame(iter_records(stream, meta), fields, chunk_size, normalize)
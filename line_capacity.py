@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+SQRT3 = np.sqrt(3)
+
+
+def parse_decimal(df: pd.DataFrame) -> np.ndarray:
+    """Decimal-comma ficha values of every column of `df`, as a 2-D float array.
+
+    All cells are converted in one vectorized pass; text that is not a number
+    becomes NaN. Frames that are already numeric are returned as they are.
+    """
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        return df.to_numpy(dtype=float, na_value=np.nan)
+
+    cells = pd.Series(df.to_numpy(dtype=object).ravel()).astype("string")
+    values = pd.to_numeric(cells.str.replace(",", ".", regex=False), errors="coerce")
+    return values.to_numpy(dtype=float, na_value=np.nan).reshape(df.shape)
+
+
+def to_mva(current_ka, voltage_kv) -> np.ndarray:
+    """Three-phase rating in MVA (rounded) of currents in kA at `voltage_kv`.
+
+    `current_ka` may be 1-D (one current per row) or 2-D (one column per
+    temperature); `voltage_kv` has one value per row.
+    """
+    current_ka = np.asarray(current_ka, dtype=float)
+    voltage_kv = np.asarray(voltage_kv, dtype=float)
+    if current_ka.ndim == 2:
+        voltage_kv = voltage_kv[:, None]
+    return np.round(current_ka * voltage_kv * SQRT3)
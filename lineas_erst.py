@@ -0,0 +1,287 @@
+import pandas as pd
+from pathlib import Path
+from checkpoints import read_frame, write_frame
+import ficha_crawler
+import ficha_snapshots
+from ficha_snapshots import FichaSnapshotStore, list_fingerprints
+import infotecnica
+from infotecnica import InfotecnicaClient
+import line_capacity
+from line_capacity import parse_decimal, to_mva
+from pipeline import Pipeline
+import snapshot_diff
+from snapshot_diff import SnapshotDiff, diff_snapshots
+import zone_workbooks
+from zone_workbooks import read_zones, write_zones
+
+# Pipeline of the ERST line tables (port of Old/Lineas_ERST_v2025-11.py).
+# Manual steps between runs:
+# - From "Tramos_Nuevos.xlsx", build "Lineas_ERST_2.xlsx" by adding the new
+#   tramos of STN and STZ/STD considered in the ERST, classified by Zona,
+#   fixing thermal-capacity magnitude errors and deleting blank rows of IDs
+#   that no longer exist. That file is the input of the TTCC pipeline and of
+#   the final "lineas_final" stage.
+
+RESOURCE = "secciones-tramos"
+# Modules the ficha stages run, part of their memoization key
+FICHA_CODE = (infotecnica, ficha_crawler, ficha_snapshots)
+
+categorias_secciones_tramos_general = {
+    "5917": "Fecha EO",
+    "5895": "Tensión nominal (kV)",
+    "1005": "Longitud Conductor (km)",
+    "5902": "Tipo de conductor",
+}
+
+categorias_secciones_tramos_termicos = {
+    "1561": "0°C",
+    "1563": "5°C",
+    "1565": "10°C",
+    "1567": "15°C",
+    "1569": "20°C",
+    "1571": "25°C",
+    "1573": "30°C",
+    "1575": "35°C",
+}
+
+temperature_columns = list(categorias_secciones_tramos_termicos.values())
+
+lista_reordenada = [
+    "id",
+    "linea_nombre",
+    "circuito_nombre",
+    "nombre",
+    "Tensión nominal (kV)",
+    "Longitud Conductor (km)",
+    "Tipo de conductor",
+    *temperature_columns,
+    "id_tramo",
+    "Fecha EO",
+]
+
+dict_nombres_final = {
+    "id": "ID",
+    "linea_nombre": "Nombre Línea",
+    "circuito_nombre": "Nombre Circuito",
+    "nombre": "Nombre Tramo",
+}
+
+
+def build_pipeline(
+    client: InfotecnicaClient | None = None,
+    store: FichaSnapshotStore | None = None,
+) -> Pipeline:
+    client = client or InfotecnicaClient()
+    store = store or FichaSnapshotStore()
+    pipeline = Pipeline("lineas_erst")
+
+    @pipeline.stage(outputs=("secciones_tramos",), ttl=24 * 3600, code=(infotecnica,))
+    def fetch_secciones_tramos():
+        # Consulta datos Secciones Tramos
+        return client.get_data(RESOURCE)
+
+    def fetch_ficha(df_secc_tramos, categorias, tipo_ficha):
+        # Only new or changed secciones are crawled; see FichaSnapshotStore.
+        df, failures = client.fetch_fichas(
+            RESOURCE,
+            df_secc_tramos["id"].tolist(),
+            list(categorias),
+            tipo_ficha,
+            categorias,
+            store=store,
+            fingerprints=list_fingerprints(df_secc_tramos),
+        )
+        if len(failures):
+            print(failures.to_string(index=False))
+        return df
+
+    @pipeline.stage(inputs=("secciones_tramos",), code=FICHA_CODE)
+    def secciones_tramos_general(df_secc_tramos):
+        # DATOS GENERALES
+        return fetch_ficha(
+            df_secc_tramos, categorias_secciones_tramos_general, "general"
+        )
+
+    @pipeline.stage(inputs=("secciones_tramos",), code=FICHA_CODE)
+    def secciones_tramos_termicos(df_secc_tramos):
+        # DATOS Termicos
+        return fetch_ficha(
+            df_secc_tramos, categorias_secciones_tramos_termicos, "limites-termicos"
+        )
+
+    @pipeline.stage(
+        inputs=(
+            "secciones_tramos",
+            "secciones_tramos_general",
+            "secciones_tramos_termicos",
+        )
+    )
+    def secciones_tramos_merged(df_secc_tramos, df_general, df_termicos):
+        # Limpieza y merge de datos Infotécnica
+        merged_df = df_secc_tramos[
+            ["id", "nombre", "linea_nombre", "circuito_nombre", "id_tramo"]
+        ]
+        for df in [df_general, df_termicos]:
+            merged_df = merged_df.merge(df, on="id", how="outer")
+        return merged_df
+
+    @pipeline.stage(inputs=("secciones_tramos_merged", "lineas_erst_ant_file"))
+    def secciones_tramos_filtered(merged_df, lineas_erst_ant_file):
+        # Filtrado por Vnom
+        # 154; 220; 500; vacío y que nombre contenga 154, 220 o 500; o 110 y que
+        # ID esté en tablas ERST año anterior.
+        merged_df = merged_df.copy()
+        merged_df["Tensión nominal (kV)"] = pd.to_numeric(
+            merged_df["Tensión nominal (kV)"].str.replace(",", "."), errors="coerce"
+        )
+
+        # Obtención líneas 110 kV ERST anterior
+        zonas_df = read_zones(
+            lineas_erst_ant_file, usecols=["ID", "Tensión nominal (kV)"]
+        )
+        ID_lineas_110kV = zonas_df.loc[
+            zonas_df["Tensión nominal (kV)"] == 110, "ID"
+        ].tolist()
+
+        vnom = merged_df["Tensión nominal (kV)"]
+        return merged_df[
+            vnom.isin([154, 220, 500])
+            | (vnom.isna() & merged_df["linea_nombre"].str.contains("154|220|500"))
+            | ((vnom == 110) & merged_df["id"].isin(ID_lineas_110kV))
+        ]
+
+    @pipeline.stage(inputs=("secciones_tramos_filtered",), code=(line_capacity,))
+    def lineas(df_cleaned_lines):
+        # Reordenamiento y renombrado columnas. Se deja al final Fecha EO (para
+        # obtener tramos nuevos) e id_tramo (para rescatar datos TTCC).
+        df_cleaned_lines = df_cleaned_lines[lista_reordenada].rename(
+            columns=dict_nombres_final
+        )
+
+        # Conversión de datos numéricos a tipo float, en un solo bloque
+        columns_to_convert = [
+            "Tensión nominal (kV)",
+            "Longitud Conductor (km)",
+            *temperature_columns,
+        ]
+        df_cleaned_lines[columns_to_convert] = parse_decimal(
+            df_cleaned_lines[columns_to_convert]
+        )
+
+        # Transformación de capacidades de kA a MVA
+        df_cleaned_lines[temperature_columns] = to_mva(
+            df_cleaned_lines[temperature_columns],
+            df_cleaned_lines["Tensión nominal (kV)"],
+        )
+        return df_cleaned_lines
+
+    @pipeline.stage(
+        inputs=("lineas", "lineas_erst_ant_file", "lineas_erst_file"),
+        code=(zone_workbooks,),
+    )
+    def export_lineas_erst(df_cleaned_lines, lineas_erst_ant_file, lineas_erst_file):
+        # Lectura ID´s tramos por zona de ERST anterior y merge con datos de
+        # Infotécnica. Se usa "left" para ver los índices de los tramos que ya no
+        # existen: al incorporar manualmente Tramos Nuevos se deben eliminar.
+        df_ID_Zonas = read_zones(lineas_erst_ant_file, usecols=["ID"])
+        df_lineas_Zonas = df_ID_Zonas.merge(df_cleaned_lines, on="ID", how="left").drop(
+            columns=["Fecha EO"]
+        )
+        write_zones(df_lineas_Zonas, lineas_erst_file, na_rep="-")
+        return str(lineas_erst_file)
+
+    @pipeline.stage(inputs=("lineas", "lineas_snapshot_file"))
+    def export_lineas_snapshot(df_cleaned_lines, lineas_snapshot_file):
+        # Snapshot for the next run, which reads it back as "..._ant"
+        write_frame(df_cleaned_lines.reset_index(drop=True), lineas_snapshot_file)
+        return str(lineas_snapshot_file)
+
+    @pipeline.stage(
+        inputs=("lineas", "lineas_ant_file"),
+        outputs=("tramos_nuevos", "tramos_eliminados", "lineas_modificadas"),
+        code=(snapshot_diff,),
+    )
+    def lineas_diff(df_cleaned_lines, lineas_ant_file):
+        # Comparación por ID con la consulta anterior: tramos nuevos, tramos
+        # eliminados y valores modificados (capacidades, kV, conductor...)
+        diff = diff_snapshots(read_frame(lineas_ant_file), df_cleaned_lines, "ID")
+        print(f"Líneas: {diff.summary()}")
+        df_nuevos = diff.added
+        # Si "Fecha EO" no se reconoce como tipo fecha, queda vacío (NaT):
+        df_nuevos["Fecha EO 2"] = pd.to_datetime(
+            df_nuevos["Fecha EO"], dayfirst=True, errors="coerce"
+        )
+        return df_nuevos, diff.removed, diff.modified
+
+    @pipeline.stage(inputs=("tramos_nuevos", "tramos_nuevos_file"))
+    def export_tramos_nuevos(df_nuevos, tramos_nuevos_file):
+        df_nuevos.to_excel(tramos_nuevos_file, na_rep="-", index=False)
+        return str(tramos_nuevos_file)
+
+    @pipeline.stage(
+        inputs=(
+            "tramos_nuevos",
+            "tramos_eliminados",
+            "lineas_modificadas",
+            "lineas_cambios_file",
+        )
+    )
+    def export_lineas_cambios(df_nuevos, df_eliminados, df_modificadas, file):
+        # Reporte de cambios respecto de la consulta anterior, para revisión
+        SnapshotDiff(["ID"], df_nuevos, df_eliminados, df_modificadas).to_excel(file)
+        return str(file)
+
+    @pipeline.stage(
+        inputs=("lineas_erst_2_file", "lineas_erst_final_file"),
+        code=(zone_workbooks,),
+    )
+    def lineas_final(lineas_erst_2_file, lineas_erst_final_file):
+        # Eliminación columnas "id_tramo" y "Tensión nominal (kV)" para obtener
+        # tabla final de líneas
+        df_Zonas = read_zones(lineas_erst_2_file)
+        write_zones(
+            df_Zonas.drop(columns=["id_tramo", "Tensión nominal (kV)"]),
+            lineas_erst_final_file,
+        )
+        return str(lineas_erst_final_file)
+
+    return pipeline
+
+
+def default_params(folder: Path = Path("Datos")) -> dict:
+    # Previous snapshot: columnar if the last run produced it, else legacy xlsx
+    lineas_ant_file = folder / "df_secciones_tramos_4_ant.feather"
+    if not lineas_ant_file.exists():
+        lineas_ant_file = folder / "df_secciones_tramos_4_ant.xlsx"
+
+    return {
+        "lineas_erst_ant_file": folder / "Lineas_ERST_2_ant.xlsx",
+        "lineas_snapshot_file": folder / "df_secciones_tramos_4.feather",
+        "lineas_ant_file": lineas_ant_file,
+        "lineas_erst_file": folder / "Lineas_ERST.xlsx",
+        "tramos_nuevos_file": folder / "Tramos_Nuevos.xlsx",
+        "lineas_cambios_file": folder / "Cambios_Lineas.xlsx",
+        "lineas_erst_2_file": folder / "Lineas_ERST_2.xlsx",
+        "lineas_erst_final_file": folder / "Lineas_ERST_final.xlsx",
+    }
+
+
+if __name__ == "__main__":
+    params = default_params()
+    pipeline = build_pipeline()
+
+    # Step 1: Infotécnica data, tables for the manual review, new tramos and
+    # changes since the previous run
+    pipeline.run(
+        [
+            "export_lineas_erst",
+            "export_lineas_snapshot",
+            "export_tramos_nuevos",
+            "export_lineas_cambios",
+        ],
+        params,
+    )
+
+    # Step 2: final tables, once "Lineas_ERST_2.xlsx" was prepared by hand
+    if params["lineas_erst_2_file"].exists():
+        pipeline.run(["lineas_final"], params)
@@ -1,75 +1,91 @@
-import pandas as pd
+import infotecnica
 import pmgd
 import reuc
+import reuc_key
+import reuc_sources
+import schemas
 from datetime import datetime
+from http_cache import ResponseCache
+from pipeline import Pipeline
 
-pmgd_fetcher = pmgd.PMGDSDataFetcher()
+# Responses are cached on disk, so re-runs within the TTL skip the downloads.
+# Use ResponseCache(offline=True) to work from the cache only.
+http_cache = ResponseCache()
+pmgd_fetcher = pmgd.PMGDSDataFetcher(cache=http_cache)
+reuc_processor = reuc.REUCDataProcessor()
 
-# Fetch raw data
-agents_df, plants_df, units_df = pmgd_fetcher.fetch_all()
+# Every stage is memoized by its inputs and code, so a re-run only recomputes
+# what changed (see pipeline.Pipeline).
+pipeline = Pipeline("pmgd")
 
-# Clean, merge, filter
-distr_units_df = pmgd_fetcher.process_data(agents_df, plants_df, units_df)
 
-# Load REUC data
-reuc_processor = reuc.REUCDataProcessor()
-reuc_agents_df, reuc_substitutions_df = reuc_processor.load_reuc_data()
+@pipeline.stage(
+    outputs=("agents", "plants", "units"),
+    ttl=12 * 3600,
+    code=(pmgd, infotecnica, schemas),
+)
+def fetch():
+    # Fetch raw data
+    return pmgd_fetcher.fetch_all()
 
-# Ensure ID columns are of type string for proper merging
-distr_units_df = distr_units_df.astype({"reuc_id": str})
 
-reuc_agents_df = reuc_agents_df.astype({"reuc_id": str})
-reuc_substitutions_df = reuc_substitutions_df.astype(
-    {"reuc_old_id": str, "reuc_new_id": str}
+@pipeline.stage(
+    inputs=("agents", "plants", "units"),
+    code=(pmgd.PMGDSDataFetcher.process_data, reuc_key),
 )
+def distr_units(agents_df, plants_df, units_df):
+    # Clean, merge, filter
+    return pmgd_fetcher.process_data(agents_df, plants_df, units_df)
+
+
+@pipeline.stage(
+    inputs=("reuc_source_version",),
+    outputs=("reuc_agents", "reuc_substitutions"),
+    code=(reuc_sources, schemas, reuc_key),
+)
+def load_reuc(source_version):
+    # Load REUC data
+    return reuc_processor.load_reuc_data()
+
 
-# Merge substitution data
-distr_units_df = distr_units_df.merge(
-    reuc_substitutions_df[
-        [
-            "reuc_old_id",
-            "reuc_new_id",
-            "ReplacementStartDate",
-            "ReplacementEndDate",
-        ]
-    ],
-    how="left",
-    left_on="reuc_id",
-    right_on="reuc_old_id",
-).drop(columns=["reuc_old_id"])
-
-distr_units_df = distr_units_df.merge(
-    reuc_agents_df[["reuc_id", "reuc_name"]],
-    how="inner",
-    left_on="reuc_id",
-    right_on="reuc_id",
-).drop(columns=["AgentName", "TechTypeName"])
-
-for index, row in distr_units_df.iterrows():
-    replacement_start = row["ReplacementStartDate"]
-    replacement_end = row["ReplacementEndDate"]
-
-    if datetime.today() >= replacement_start and datetime.today() <= replacement_end:
-        reuc_new_id = row["reuc_new_id"]
-
-        reuc_new_name = reuc_agents_df.loc[
-            reuc_agents_df["reuc_id"] == reuc_new_id, "reuc_name"
-        ]
-
-        distr_units_df.at[index, "reuc_id"] = reuc_new_id
-        distr_units_df.at[index, "reuc_name"] = reuc_new_name.values[0]
-
-        print(f"Unit {row['GeneratingUnitID']} is under REUC substitution.")
-
-distr_units_df["reuc_id"] = pd.to_numeric(
-    distr_units_df["reuc_id"], errors="coerce"
-).astype("int64")
-
-
-distr_units_df.drop(
-    columns=["reuc_new_id", "ReplacementStartDate", "ReplacementEndDate"]
-).to_excel(
-    f"output\\output at {datetime.now().strftime('%Y.%m.%d %H.%M.%S')}.xlsx",
-    sheet_name="GeneratingUnit",
-    index=False,
+@pipeline.stage(
+    inputs=("distr_units", "reuc_agents", "reuc_substitutions", "as_of"),
+    code=(reuc.SubstitutionIndex, reuc.REUCDataProcessor.resolve_substitutions),
 )
+def resolved_units(distr_units_df, reuc_agents_df, reuc_substitutions_df, as_of):
+    # reuc_id is the integer REUC key on both sides (see reuc_key): no casts
+
+    # Attach REUC names
+    distr_units_df = distr_units_df.merge(
+        reuc_agents_df[["reuc_id", "reuc_name"]],
+        how="inner",
+        left_on="reuc_id",
+        right_on="reuc_id",
+    ).drop(columns=["PlantID", "AgentName", "TechTypeName"])
+
+    # Apply substitutions active at run time, following substitution chains
+    substitution_index = reuc_processor.build_substitution_index(
+        reuc_substitutions_df, as_of=as_of
+    )
+    return reuc_processor.resolve_substitutions(
+        distr_units_df, reuc_agents_df, substitution_index
+    )
+
+
+@pipeline.stage(inputs=("resolved_units", "output_file"))
+def export(distr_units_df, output_file):
+    distr_units_df.to_excel(output_file, sheet_name="GeneratingUnit", index=False)
+    return output_file
+
+
+if __name__ == "__main__":
+    run_time = datetime.now()
+    output_file = f"output\\output at {run_time.strftime('%Y.%m.%d %H.%M.%S')}.xlsx"
+    pipeline.run(
+        params={
+            # Changes with the REUC snapshot or workbooks, re-running load_reuc
+            "reuc_source_version": reuc_processor.source.version(),
+            "as_of": run_time,
+            "output_file": output_file,
+        }
+    )
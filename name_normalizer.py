@@ -0,0 +1,46 @@
+import re
+
+import pandas as pd
+
+# Normalization of substation/bay names ("extremo" of tramos, "pano_nombre"
+# of TTCC) so both sides of the TTCC join use the same spelling:
+# 1. Drop the "Tap: ", "Paño: ", "Punto: " ... labels at the start
+# 2. Collapse whitespace and cut the last word at "/" ("J1/J2" -> "J1")
+# 3. Drop the "PA " added to new tramos and TTCC ("PA S/E" -> "S/E")
+# 4. Remove accents of capital vowels
+PREFIX = re.compile(r"^(?:Tap ?: |Paño ?: |Punto: )")
+WHITESPACE = re.compile(r"\s+")
+LAST_WORD_PAIR = re.compile(r"/\S*$")
+PA_PREFIX = re.compile(r"PA S/E")
+ACCENTS = str.maketrans("ÁÉÍÓÚ", "AEIOU")
+
+# Extremos that are tap-offs or structures, which have no TTCC
+NON_BAY_PREFIXES = ("TAP", "EST")
+
+
+def _normalize(names: pd.Series) -> pd.Series:
+    return (
+        names.astype("string")
+        .str.replace(PREFIX, "", regex=True)
+        .str.replace(WHITESPACE, " ", regex=True)
+        .str.strip()
+        .str.replace(LAST_WORD_PAIR, "", regex=True)
+        .str.replace(PA_PREFIX, "S/E", regex=True)
+        .str.translate(ACCENTS)
+    )
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Normalized version of every name in `names`; missing values stay missing.
+
+    Each distinct name is normalized once, with vectorized string operations,
+    and mapped back onto the rows.
+    """
+    unique = pd.Series(names.dropna().unique(), dtype=object)
+    normalized = dict(zip(unique, _normalize(unique)))
+    return names.map(normalized).astype("string")
+
+
+def is_bay_name(names: pd.Series) -> pd.Series:
+    """Whether each normalized name can be a bay, i.e. is not a tap or structure."""
+    return ~names.str.startswith(NON_BAY_PREFIXES).fillna(False).astype(bool)
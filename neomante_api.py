@@ -0,0 +1,200 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+from api_client import ApiClient
+from http_cache import ResponseCache
+from json_stream import records_to_frame
+from schemas import LIMITACIONES, REPORTE_FALLAS, Schema
+
+# Operator suffixes of the date filters of the Neomante APIs
+DATE_OPERATORS = ("Lt", "Lte", "Gt", "Gte")
+
+
+def to_param_name(name: str) -> str:
+    """Query parameter of a Python filter name: "id_central_in" -> "idCentralIn"."""
+    first, *rest = name.split("_")
+    return first + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def to_param_value(value) -> str:
+    """Query string of a filter value; lists become comma-separated."""
+    if pd.api.types.is_list_like(value):
+        return ",".join(to_param_value(item) for item in value)
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (datetime, date)):
+        return pd.Timestamp(value).strftime("%Y-%m-%dT%H:%M:%S")
+    return str(value)
+
+
+def filter_params(filters: dict, allowed: set, label: str = "API") -> dict:
+    """Query parameters for `filters` given as Python keyword arguments.
+
+    Names are snake_case (`fecha_inicio_local_gte`) or the camelCase of the
+    API (`fechaInicioLocalGte`); None values are left out. Filters not in
+    `allowed` raise ValueError instead of being silently ignored by the server.
+    """
+    params = {}
+    for name, value in filters.items():
+        if value is None:
+            continue
+        param = to_param_name(name)
+        if param not in allowed:
+            raise ValueError(f"Unknown {label} filter '{name}'")
+        params[param] = to_param_value(value)
+    return params
+
+
+class NeomanteApiClient(ApiClient):
+    """Base client for the Neomante `/v2` APIs of the Coordinador.
+
+    They share the query-string filters (`<field><Operator>`) and the
+    PagedResponse*Dto pages (`content`, `totalPages`, pages from 0).
+    Subclasses give the `service` path, the `filters` it accepts (field ->
+    operator suffixes, "" being equality) and the `schema` of its records.
+    """
+
+    service = ""
+    path = "v2"
+    filters: dict = {}
+    schema: Schema = Schema({"id": "string"})
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str = None,
+        cache: ResponseCache | bool | None = None,
+        **kwargs,
+    ):
+        base_url = base_url or (
+            f"https://citizen-cen-api.apps.prod-os-1.coordinador.cl/neomante/"
+            f"{self.service}"
+        )
+        # None: the default cache folder; False: no cache at all
+        if cache is None:
+            cache = ResponseCache(Path("cache/neomante"))
+        super().__init__(base_url, api_key, cache=cache or None, **kwargs)
+        self.filter_names = {
+            field + operator
+            for field, operators in self.filters.items()
+            for operator in operators
+        }
+
+    def filter_params(self, **filters) -> dict:
+        """Query parameters of `filters`; see `filter_params`."""
+        return filter_params(filters, self.filter_names, self.service)
+
+    def fetch_page(
+        self, page: int, page_size: int, params: dict, path: str | None = None
+    ) -> dict:
+        """One PagedResponse*Dto of `path` (default `/v2`); pages start at 0."""
+        return self.fetch_json(
+            path or self.path,
+            {"user_key": self.api_key, **params, "page": page, "size": page_size},
+        )
+
+    def iter_pages(
+        self,
+        params: dict,
+        page_size: int = 500,
+        max_workers: int | None = None,
+        schema: Schema | None = None,
+        path: str | None = None,
+    ):
+        """Yield one DataFrame of `schema` fields per page, in page order.
+
+        The first page tells `totalPages`; the others are then requested
+        concurrently and each one is turned into columns as it is consumed.
+        """
+        fields = (schema or self.schema).fields
+        first = self.fetch_page(0, page_size, params, path)
+        yield records_to_frame(first.get("content") or [], fields)
+
+        n_pages = int(first.get("totalPages") or 1)
+        if n_pages <= 1:
+            return
+
+        workers = min(max_workers or self.pool_size, n_pages - 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = executor.map(
+                lambda page: self.fetch_page(page, page_size, params, path),
+                range(1, n_pages),
+            )
+            for page in pages:
+                yield records_to_frame(page.get("content") or [], fields)
+
+    def get_records(
+        self,
+        page_size: int = 500,
+        max_workers: int | None = None,
+        schema: Schema | None = None,
+        **filters,
+    ) -> pd.DataFrame:
+        """Records matching `filters`, filtered by the server and typed by `schema`.
+
+        Nested fields are named "a.b", as by `pd.json_normalize`.
+        """
+        schema = schema or self.schema
+        params = self.filter_params(**filters)
+        frames = list(self.iter_pages(params, page_size, max_workers, schema))
+        return schema.apply(pd.concat(frames, ignore_index=True))
+
+
+class LimitationApiClient(NeomanteApiClient):
+    """Limitations of generating units and facilities (`neomante/limitaciones`)."""
+
+    service = "limitaciones"
+    filters = {
+        "id": ("", "In"),
+        "correlativo": ("",),
+        "correlativoAsociadoPrefijo": ("",),
+        "correlativoAsociado": ("",),
+        "idCorrelativoAsociado": ("", "In"),
+        "casoCorrelativoAsociado": ("", "In"),
+        "status": ("", "In", "Ne"),
+        "type": ("", "In"),
+        "idEmpresa": ("", "In"),
+        "idUnidad": ("",),
+        "idCentral": ("",),
+        "idSubestacion": ("",),
+        "idLinea": ("",),
+        "elementoATrabajar": ("", "In"),
+        "afectaSscc": ("",),
+        "created": ("", *DATE_OPERATORS),
+        "fechaPerturbacion": ("", *DATE_OPERATORS),
+        "fechaRetornoEstimada": ("", *DATE_OPERATORS),
+        "fechaEfectivaRetorno": ("", *DATE_OPERATORS),
+        "ordering": ("",),
+    }
+    schema = LIMITACIONES
+
+
+class FailReportApiClient(NeomanteApiClient):
+    """Failure reports (`neomante/reporte-fallas`)."""
+
+    service = "reporte-fallas"
+    filters = {
+        "id": ("", "In", "Ne"),
+        "correlativo": ("",),
+        "correlativoAsociadoPrefijo": ("",),
+        "correlativoAsociado": ("",),
+        "idCorrelativoAsociado": ("", "In"),
+        "casoCorrelativoAsociado": ("", "In"),
+        "fechaPerturbacion": ("", *DATE_OPERATORS),
+        "fechaRetornoEstimada": ("", *DATE_OPERATORS),
+        "fechaEfectivaRetorno": ("", *DATE_OPERATORS),
+        "status": ("", "In", "Ne"),
+        "idEmpresa": ("", "In"),
+        "type": ("", "In"),
+        "idCentral": ("",),
+        "idSubestacion": ("",),
+        "idLinea": ("",),
+        "elementoATrabajar": ("", "In"),
+        "created": ("Lt", "Gte"),
+        "afectaSscc": ("",),
+        "afectaMedidores": ("",),
+        "afectaProtecciones": ("",),
+    }
+    schema = REPORTE_FALLAS
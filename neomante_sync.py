@@ -0,0 +1,142 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+from checkpoints import CheckpointStore
+from neomante_api import FailReportApiClient, LimitationApiClient, NeomanteApiClient
+
+
+class IncrementalSync:
+    """Local columnar copy of a Neomante API, kept up to date by time window.
+
+    The records are stored as a checkpoint in `folder/<service>`, next to a
+    state file with the high-water mark: the latest `watermark` timestamp
+    seen. Each `sync` only requests records with `watermark` from the mark
+    (minus `overlap`, for late arrivals) and re-reads by id the stored
+    records still open (no `open_column` yet), since the APIs cannot filter
+    by modification date. Records are upserted by id.
+
+    Open records in one of `terminal_statuses` (e.g. cancelled or rejected
+    ones, which never get a return date) are not re-read, nor those whose
+    `watermark` is more than `max_open_age` older than the newest record.
+    """
+
+    def __init__(
+        self,
+        client: NeomanteApiClient,
+        folder: Path = Path("cache/neomante_sync"),
+        watermark: str = "created",
+        open_column: str | None = "fechaEfectivaRetorno",
+        overlap: timedelta = timedelta(days=1),
+        batch_size: int = 200,
+        terminal_statuses: tuple = (),
+        max_open_age: timedelta | None = timedelta(days=365),
+    ):
+        self.client = client
+        self.store = CheckpointStore(Path(folder) / client.service)
+        self.state_path = self.store.folder / "state.json"
+        self.watermark = watermark
+        self.open_column = open_column
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self.terminal_statuses = terminal_statuses
+        self.max_open_age = max_open_age
+
+    def records(self) -> pd.DataFrame:
+        """Every record synced so far."""
+        if not self.store.exists("records"):
+            return self.client.schema.apply(pd.DataFrame())
+        return self.store.load("records")
+
+    def state(self) -> dict:
+        if not self.state_path.exists():
+            return {}
+        return json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def window_start(self, since: datetime | None = None) -> pd.Timestamp | None:
+        """Start of the next window: the high-water mark minus `overlap`.
+
+        Before the first sync, `since` (None requests the whole history).
+        """
+        high_water_mark = self.state().get("high_water_mark")
+        if high_water_mark is None:
+            return pd.Timestamp(since) if since is not None else None
+        return pd.Timestamp(high_water_mark) - self.overlap
+
+    def fetch_open(self, stored_df: pd.DataFrame, exclude: pd.Series) -> list:
+        """Re-read the stored records still open, `batch_size` ids per request."""
+        if self.open_column is None or stored_df.empty:
+            return []
+        open_rows = stored_df[self.open_column].isna() & ~stored_df["id"].isin(exclude)
+        if self.terminal_statuses:
+            open_rows &= ~stored_df["status"].isin(self.terminal_statuses)
+        if self.max_open_age is not None:
+            watermark = stored_df[self.watermark]
+            open_rows &= watermark >= watermark.max() - self.max_open_age
+        open_ids = stored_df.loc[open_rows, "id"].tolist()
+        return [
+            self.client.get_records(id_in=open_ids[i : i + self.batch_size])
+            for i in range(0, len(open_ids), self.batch_size)
+        ]
+
+    def sync(self, since: datetime | None = None) -> pd.DataFrame:
+        """Bring the local copy up to date and return the records received."""
+        stored_df = self.records()
+        start = self.window_start(since)
+
+        new_df = self.client.get_records(**{f"{self.watermark}_gte": start})
+        changes_df = pd.concat(
+            [new_df, *self.fetch_open(stored_df, new_df["id"])], ignore_index=True
+        ).drop_duplicates(subset="id", keep="last")
+
+        # Upsert by id: received records replace their stored version
+        records_df = self.client.schema.apply(
+            pd.concat(
+                [stored_df[~stored_df["id"].isin(changes_df["id"])], changes_df],
+                ignore_index=True,
+            )
+        )
+        self.store.save("records", records_df)
+
+        high_water_mark = records_df[self.watermark].max()
+        self.state_path.write_text(
+            json.dumps(
+                {
+                    "high_water_mark": (
+                        None if pd.isna(high_water_mark) else high_water_mark
+                    ),
+                    "window_start": start,
+                    "synced_at": datetime.now(),
+                    "received": len(changes_df),
+                    "records": len(records_df),
+                },
+                default=str,
+                indent=1,
+            ),
+            encoding="utf-8",
+        )
+        print(
+            f"[{self.client.service}] {len(changes_df)} records received since "
+            f"{start or 'the beginning'}, {len(records_df)} stored."
+        )
+        return changes_df
+
+
+def sync_all(api_key: str, since: datetime | None = None) -> dict:
+    """Sync limitaciones and reporte-fallas; return the records of each one."""
+    # The local copies are the cache: responses are not stored.
+    syncs = [
+        IncrementalSync(LimitationApiClient(api_key=api_key, cache=False)),
+        IncrementalSync(FailReportApiClient(api_key=api_key, cache=False)),
+    ]
+    for sync in syncs:
+        sync.sync(since)
+    return {sync.client.service: sync.records() for sync in syncs}
+
+
+if __name__ == "__main__":
+    import api_key
+
+    # The first run pulls one year; later runs only the window since the last.
+    sync_all(api_key.reuc_api_key, since=datetime.now() - timedelta(days=365))
@@ -0,0 +1,271 @@
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+from http_cache import ResponseCache
+from json_stream import records_to_frame
+from neomante_api import NeomanteApiClient, filter_params, to_param_name
+from schemas import Schema
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - PyYAML is optional
+    yaml = None
+
+SPECS_FOLDER = Path("reuc_api_example_files")
+
+# Query parameters set by the client rather than by the caller
+PAGING_PARAMS = {"page", "size"}
+KEY_PARAM = "user_key"
+
+
+def read_text(path: Path) -> str:
+    """Text of a spec file, UTF-8 or UTF-16 (with or without BOM)."""
+    raw = Path(path).read_bytes()
+    if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return raw.decode("utf-16")
+    if raw[1:2] == b"\x00":
+        return raw.decode("utf-16-le")
+    if raw[:1] == b"\x00":
+        return raw.decode("utf-16-be")
+    return raw.decode("utf-8-sig")
+
+
+def load_spec(path: Path) -> dict:
+    """OpenAPI document of a .json, .yaml or .yml file."""
+    path = Path(path)
+    text = read_text(path)
+    if path.suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise ImportError(f"PyYAML is needed to read {path}")
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def ref_name(node) -> str | None:
+    """Component name of a `$ref` node ("#/components/schemas/X" -> "X")."""
+    ref = node.get("$ref") if isinstance(node, dict) else None
+    return ref.rsplit("/", 1)[-1] if ref else None
+
+
+def resolve(spec: dict, node):
+    """`node`, or the part of `spec` its `$ref` points to."""
+    seen = set()
+    while isinstance(node, dict) and "$ref" in node:
+        ref = node["$ref"]
+        if ref in seen:
+            raise ValueError(f"Circular $ref {ref}")
+        seen.add(ref)
+        node = spec
+        for part in ref.lstrip("#/").split("/"):
+            node = node[part]
+    return node
+
+
+def to_dtype(prop: dict) -> str | None:
+    """Compact pandas dtype of a scalar property; None for objects and arrays."""
+    kind = prop.get("type")
+    if kind == "integer":
+        return "Int64"
+    if kind == "number":
+        return "float64"
+    if kind == "boolean":
+        return "boolean"
+    if kind == "string":
+        if prop.get("format") in ("date-time", "date"):
+            return "datetime64[ns]"
+        if "enum" in prop:
+            return "category"
+        return "string"
+    return None
+
+
+def schema_fields(spec: dict, node: dict, depth: int = 1, prefix="", seen=()):
+    """Yield (field, dtype) for the scalar properties of an object schema.
+
+    Nested objects are flattened `depth` levels deep into "a.b" fields, as
+    by `pd.json_normalize`; arrays and deeper objects are left out.
+    """
+    for name, prop in (resolve(spec, node).get("properties") or {}).items():
+        ref = ref_name(prop)
+        prop = resolve(spec, prop)
+        if "properties" in prop:
+            if depth > 0 and (ref is None or ref not in seen):
+                yield from schema_fields(
+                    spec, prop, depth - 1, f"{prefix}{name}.", (*seen, ref)
+                )
+            continue
+        dtype = to_dtype(prop)
+        if dtype is not None:
+            yield prefix + name, dtype
+
+
+def component_schema(spec: dict, node: dict, depth: int = 1) -> Schema:
+    """Schema of the records described by `node` (usually a `$ref`)."""
+    return Schema(dict(schema_fields(spec, node, depth, seen=(ref_name(node),))))
+
+
+def to_method_name(operation: dict, method: str, path: str) -> str:
+    """Python name of an operation: its operationId, summary or method and path."""
+    if operation.get("operationId"):
+        name = re.sub(r"(?<!^)(?=[A-Z])", "_", operation["operationId"])
+    else:
+        name = operation.get("summary") or f"{method} {path}"
+    return re.sub(r"\W+", "_", name.lower(), flags=re.ASCII).strip("_")
+
+
+@dataclass
+class Endpoint:
+    """GET operation of a spec, with what the client needs to call it."""
+
+    name: str
+    path: str
+    path_params: list
+    query_params: set
+    sends_key: bool
+    paged: bool
+    schema: Schema | None
+    doc: str = ""
+
+
+def read_endpoints(spec: dict, depth: int = 1) -> dict[str, Endpoint]:
+    """Endpoints of the GET operations of `spec`, by method name.
+
+    Responses typed as PagedResponse* (an object with `content` and
+    `totalPages`) are read page by page; their records, and those of list
+    responses, are typed by a schema derived from `components.schemas`.
+    """
+    endpoints = {}
+    for path, operations in spec.get("paths", {}).items():
+        operation = operations.get("get")
+        if operation is None:
+            continue
+        params = [resolve(spec, param) for param in operation.get("parameters", [])]
+        query = {param["name"] for param in params if param.get("in") == "query"}
+
+        response = resolve(spec, (operation.get("responses") or {}).get("200") or {})
+        contents = list((response.get("content") or {}).values())
+        body = contents[0].get("schema") if contents else None
+        body_node = resolve(spec, body) if body else {}
+        properties = body_node.get("properties") or {}
+
+        paged = "content" in properties and "totalPages" in properties
+        if paged:
+            records = properties["content"].get("items")
+        elif body_node.get("type") == "array":
+            records = body_node.get("items")
+        else:
+            records = None
+
+        name = to_method_name(operation, "get", path)
+        endpoints[name] = Endpoint(
+            name=name,
+            path=path,
+            path_params=[p["name"] for p in params if p.get("in") == "path"],
+            query_params=query - PAGING_PARAMS - {KEY_PARAM},
+            sends_key=KEY_PARAM in query,
+            paged=paged and PAGING_PARAMS <= query,
+            schema=component_schema(spec, records, depth) if records else None,
+            doc=operation.get("description") or operation.get("summary") or "",
+        )
+    return endpoints
+
+
+class SpecClient(NeomanteApiClient):
+    """Client whose endpoint methods are read from an OpenAPI document.
+
+    Every GET operation becomes a method named after its operationId (e.g.
+    `find_limitation_by_filter`), taking its path and query parameters as
+    keyword arguments (snake_case or camelCase). Paged endpoints fetch their
+    pages concurrently, like NeomanteApiClient, and list results come back
+    as DataFrames typed by the spec schemas.
+    """
+
+    def __init__(
+        self,
+        spec: dict | Path,
+        base_url: str | None = None,
+        api_key: str = None,
+        cache: ResponseCache | None = None,
+        depth: int = 1,
+        **kwargs,
+    ):
+        self.spec = spec if isinstance(spec, dict) else load_spec(spec)
+        self.service = self.spec.get("info", {}).get("title", "API")
+        self.endpoints = read_endpoints(self.spec, depth)
+        base_url = base_url or self.spec["servers"][0]["url"]
+        cache = cache or ResponseCache(Path("cache/openapi"))
+        super().__init__(base_url, api_key, cache=cache, **kwargs)
+
+    def __getattr__(self, name: str):
+        endpoints = self.__dict__.get("endpoints") or {}
+        if name not in endpoints:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        def method(**params):
+            return self.call(name, **params)
+
+        method.__name__ = name
+        method.__doc__ = endpoints[name].doc
+        return method
+
+    def __dir__(self):
+        return [*super().__dir__(), *self.endpoints]
+
+    def call(
+        self,
+        name: str,
+        page_size: int = 500,
+        max_workers: int | None = None,
+        **params,
+    ):
+        """Call endpoint `name`: a DataFrame for lists and pages, else the JSON."""
+        endpoint = self.endpoints[name]
+        params = {to_param_name(param): value for param, value in params.items()}
+
+        missing = [param for param in endpoint.path_params if params.get(param) is None]
+        if missing:
+            raise ValueError(f"Missing path parameters {missing} of {name}")
+        path = endpoint.path.format(
+            **{param: params.pop(param) for param in endpoint.path_params}
+        )
+        query = filter_params(params, endpoint.query_params, name)
+
+        if endpoint.paged:
+            frames = self.iter_pages(
+                query, page_size, max_workers, endpoint.schema, path
+            )
+            return endpoint.schema.apply(pd.concat(list(frames), ignore_index=True))
+
+        if endpoint.sends_key:
+            query = {KEY_PARAM: self.api_key, **query}
+        data = self.fetch_json(path, query)
+        if not isinstance(data, list):
+            return data
+        if endpoint.schema is None:
+            return records_to_frame(data)
+        return endpoint.schema.apply(records_to_frame(data, endpoint.schema.fields))
+
+
+def load_clients(folder: Path = SPECS_FOLDER, **kwargs) -> dict[str, SpecClient]:
+    """A SpecClient for every OpenAPI document in `folder`, by file stem."""
+    return {
+        path.stem: SpecClient(path, **kwargs)
+        for path in sorted(Path(folder).iterdir())
+        if path.suffix in (".json", ".yaml", ".yml")
+    }
+
+
+if __name__ == "__main__":
+    import api_key
+
+    for stem, client in load_clients(api_key=api_key.reuc_api_key).items():
+        print(f"{stem}: {client.base_url}")
+        for endpoint in client.endpoints.values():
+            fields = len(endpoint.schema.fields) if endpoint.schema else 0
+            kind = "paged" if endpoint.paged else "single"
+            print(f"  {endpoint.name} ({kind}, {fields} typed fields)")
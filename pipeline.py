@@ -0,0 +1,236 @@
+import hashlib
+import inspect
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+from checkpoints import CheckpointStore
+
+
+def fingerprint(value) -> str:
+    """Content hash of a stage input or output."""
+    digest = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        try:
+            hashes = pd.util.hash_pandas_object(value, index=True)
+        except TypeError:  # Unhashable cells, e.g. lists from str.findall.
+            hashes = pd.util.hash_pandas_object(value.astype(str), index=True)
+        digest.update(hashes.to_numpy().tobytes())
+        digest.update(
+            json.dumps(
+                [list(map(str, value.columns)), list(map(str, value.dtypes))]
+            ).encode()
+        )
+    elif isinstance(value, Path):
+        # Files are identified by path, size and modification time.
+        stat = value.stat() if value.exists() else None
+        state = [stat.st_size, stat.st_mtime_ns] if stat else "missing"
+        digest.update(json.dumps([str(value.resolve()), state]).encode())
+    else:
+        digest.update(json.dumps(value, default=str, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class Stage:
+    """A pipeline step: `func(*inputs)` returning one value per output.
+
+    Inputs are names of other stages' outputs or of run parameters. DataFrame
+    outputs are checkpointed; other outputs must be JSON-serializable.
+    `ttl` (seconds) bounds how long a memoized result stays valid, which is
+    how network stages are refreshed. `code` lists helper functions or
+    modules whose source also invalidates the stage when edited.
+    """
+
+    name: str
+    func: Callable
+    inputs: tuple = ()
+    outputs: tuple = ()
+    version: str = "1"
+    ttl: float | None = None
+    code: tuple = ()
+
+    def code_hash(self) -> str:
+        digest = hashlib.sha256(self.version.encode())
+        for obj in (self.func, *self.code):
+            try:
+                source = inspect.getsource(obj)
+            except (OSError, TypeError):
+                source = obj.__code__.co_code.hex()
+            digest.update(source.encode())
+        return digest.hexdigest()
+
+    def key(self, input_hashes: list[str]) -> str:
+        """Memoization key: code version plus the content of every input."""
+        payload = json.dumps([self.name, self.code_hash(), input_hashes])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Pipeline:
+    """Declarative stage graph with resumable, memoized stages.
+
+    Each stage result is stored with the hash of its inputs and code. A re-run
+    recomputes only the stages whose key changed (or whose `ttl` expired); the
+    others are reused from the checkpoints, loaded only when a recomputed
+    stage needs them.
+    """
+
+    def __init__(self, name: str, checkpoints: CheckpointStore | None = None):
+        self.name = name
+        self.checkpoints = checkpoints or CheckpointStore(
+            Path("cache/pipelines") / name
+        )
+        self.manifest_path = self.checkpoints.folder / "manifest.json"
+        self.stages: dict[str, Stage] = {}
+        self.producers: dict[str, Stage] = {}
+
+    def add(self, stage: Stage) -> Stage:
+        if not stage.outputs:
+            stage.outputs = (stage.name,)
+        for output in stage.outputs:
+            if output in self.producers:
+                raise ValueError(f"Output '{output}' is produced by two stages")
+            self.producers[output] = stage
+        self.stages[stage.name] = stage
+        return stage
+
+    def stage(self, inputs=(), outputs=(), version="1", ttl=None, code=(), name=None):
+        """Decorator declaring `func` as a stage of this pipeline."""
+
+        def decorator(func):
+            self.add(
+                Stage(
+                    name or func.__name__,
+                    func,
+                    tuple(inputs),
+                    tuple(outputs),
+                    version,
+                    ttl,
+                    tuple(code),
+                )
+            )
+            return func
+
+        return decorator
+
+    def plan(self, targets: list, params: dict) -> list[Stage]:
+        """Stages needed for `targets`, in dependency order."""
+        order, done, visiting = [], set(), set()
+
+        def visit(stage: Stage):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Stage '{stage.name}' depends on itself")
+            visiting.add(stage.name)
+            for input in stage.inputs:
+                if input in self.producers:
+                    visit(self.producers[input])
+                elif input not in params:
+                    raise ValueError(f"Unknown input '{input}' of stage '{stage.name}'")
+            visiting.discard(stage.name)
+            done.add(stage.name)
+            order.append(stage)
+
+        for target in targets:
+            if target in self.stages:
+                visit(self.stages[target])
+            elif target in self.producers:
+                visit(self.producers[target])
+            else:
+                raise ValueError(f"Unknown stage or output '{target}'")
+        return order
+
+    def run(
+        self, targets: list | None = None, params: dict | None = None, force=()
+    ) -> dict:
+        """Run the stages needed for `targets` (default: all) and return their outputs.
+
+        Args:
+        - targets: Stage or output names to produce.
+        - params: Values for inputs that no stage produces (paths, options).
+        - force: Stage names to recompute even if memoized.
+        """
+        params = params or {}
+        targets = list(targets or self.stages)
+        manifest = self.load_manifest()
+        values = dict(params)
+        hashes = {name: fingerprint(value) for name, value in params.items()}
+
+        for stage in self.plan(targets, params):
+            key = stage.key([hashes[input] for input in stage.inputs])
+            entry = manifest.get(stage.name)
+            if stage.name not in force and self.is_valid(stage, entry, key):
+                hashes.update(zip(stage.outputs, entry["hashes"]))
+                print(f"[{self.name}] {stage.name}: up to date")
+                continue
+
+            print(f"[{self.name}] {stage.name}: running")
+            start_time = time.time()
+            args = [self.value(input, values, manifest) for input in stage.inputs]
+            result = stage.func(*args)
+            results = result if len(stage.outputs) > 1 else (result,)
+
+            entry = {"key": key, "created_at": time.time(), "hashes": [], "values": {}}
+            for output, value in zip(stage.outputs, results):
+                values[output] = value
+                hashes[output] = fingerprint(value)
+                entry["hashes"].append(hashes[output])
+                if isinstance(value, pd.DataFrame):
+                    self.checkpoints.save(output, value)
+                else:
+                    entry["values"][output] = value
+            manifest[stage.name] = entry
+            self.save_manifest(manifest)
+            print(
+                f"[{self.name}] {stage.name}: done in {time.time() - start_time:.2f} s"
+            )
+
+        outputs = [
+            output
+            for target in targets
+            for output in (
+                self.stages[target].outputs if target in self.stages else (target,)
+            )
+        ]
+        return {output: self.value(output, values, manifest) for output in outputs}
+
+    def is_valid(self, stage: Stage, entry: dict | None, key: str) -> bool:
+        if entry is None or entry["key"] != key:
+            return False
+        if stage.ttl is not None and time.time() - entry["created_at"] > stage.ttl:
+            return False
+        return all(
+            output in entry["values"] or self.checkpoints.exists(output)
+            for output in stage.outputs
+        )
+
+    def value(self, name: str, values: dict, manifest: dict):
+        """Value of an input or output, loading memoized outputs on demand."""
+        if name not in values:
+            entry = manifest[self.producers[name].name]
+            if name in entry["values"]:
+                values[name] = entry["values"][name]
+            else:
+                values[name] = self.checkpoints.load(name)
+        return values[name]
+
+    def invalidate(self, *stage_names: str):
+        """Forget memoized results so the stages run again."""
+        manifest = self.load_manifest()
+        for name in stage_names:
+            manifest.pop(name, None)
+        self.save_manifest(manifest)
+
+    def load_manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return {}
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+
+    def save_manifest(self, manifest: dict):
+        self.manifest_path.write_text(
+            json.dumps(manifest, indent=1, default=str), encoding="utf-8"
+        )
@@ -1,27 +1,65 @@
-import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from infotecnica import InfotecnicaClient
+from reuc_key import parse_descripcion_ids
+from schemas import CENTRALES, GRUPOS, UNIDADES_GENERADORAS, Schema
 
 
-class PMGDSDataFetcher:
-    def __init__(self):
+class PMGDSDataFetcher(InfotecnicaClient):
+    def __init__(
+        self, base_url: str = "https://api-infotecnica.coordinador.cl/v1", **kwargs
+    ):
+        super().__init__(base_url, **kwargs)
         self.url_agents = "https://api-infotecnica.coordinador.cl/v1/grupos"
         self.url_plants = "https://api-infotecnica.coordinador.cl/v1/centrales/"
         self.url_units = (
             "http://api-infotecnica.coordinador.cl/v1/unidades-generadoras/"
         )
 
-    def fetch_json(self, url):
-        """Download JSON with error handling."""
-        resp = requests.get(url, verify=False, timeout=30)  # 👈 OJO: verify=False
-        resp.raise_for_status()
-        return resp.json()
+    def fetch_df(self, url, schema: Schema | None = None):
+        """Download one dataset, page by page, into a DataFrame.
+
+        With a `schema`, only its fields are decoded and they get its dtypes.
+        """
+        if schema is None:
+            return self.get_data_by_pages(url)
+        return schema.apply(self.get_data_by_pages(url, fields=schema.fields))
 
     def fetch_all(self):
-        """Download and load all datasets."""
-        agents_df = pd.json_normalize(self.fetch_json(self.url_agents))
-        plants_df = pd.json_normalize(self.fetch_json(self.url_plants))
-        units_df = pd.json_normalize(self.fetch_json(self.url_units))
-        return agents_df, plants_df, units_df
+        """Download and load all datasets concurrently."""
+        urls = {
+            "agents": self.url_agents,
+            "plants": self.url_plants,
+            "units": self.url_units,
+        }
+        schemas = {
+            "agents": GRUPOS,
+            "plants": CENTRALES,
+            "units": UNIDADES_GENERADORAS,
+        }
+
+        # Each worker downloads and normalizes its own dataset, so flattening
+        # one response overlaps the remaining downloads.
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            futures = {
+                name: executor.submit(self.fetch_df, url, schemas[name])
+                for name, url in urls.items()
+            }
+
+        results, errors = {}, {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+
+        if errors:
+            details = "; ".join(f"{urls[name]}: {e}" for name, e in errors.items())
+            raise RuntimeError(f"Failed to download {details}") from next(
+                iter(errors.values())
+            )
+
+        return results["agents"], results["plants"], results["units"]
 
     def process_data(
         self, agents_df: pd.DataFrame, plants_df: pd.DataFrame, units_df: pd.DataFrame
@@ -47,8 +85,13 @@ class PMGDSDataFetcher:
         )
         agents_df = agents_df.rename(columns={"id": "AgentID"})
 
-        # --- Extract reuc_id ---
-        agents_df["reuc_id"] = agents_df["descripcion"].str.split("_").str[-1]
+        # --- Extract reuc_id ("<name>_<id>"), reporting malformed descriptions ---
+        agents_df["reuc_id"], malformed = parse_descripcion_ids(
+            agents_df["descripcion"]
+        )
+        if malformed.any():
+            print(f"{malformed.sum()} grupos have no REUC id in their descripcion:")
+            print(agents_df.loc[malformed, ["AgentID", "descripcion"]].to_string())
 
         # --- Merge into plants ---
         plants_df = plants_df.merge(
@@ -70,6 +113,7 @@ class PMGDSDataFetcher:
 
         fields_to_save = [
             "GeneratingUnitID",
+            "PlantID",
             "UnitName",
             "PlantName",
             "TechTypeName",
@@ -88,6 +132,7 @@ class PMGDSDataFetcher:
 
         fields_to_save = [
             "GeneratingUnitID",
+            "PlantID",
             "UnitName",
             "PlantName",
             "TechTypeName",
@@ -1,109 +1,141 @@
 import pandas as pd
+from datetime import datetime
 from pathlib import Path
+from checkpoints import CheckpointStore
+from reuc_sources import ReucSource, default_source
+
+
+class SubstitutionIndex:
+    """Final active holder of every substituted REUC id, resolved once at `as_of`."""
+
+    def __init__(self, substitutions_df: pd.DataFrame, as_of: datetime | None = None):
+        self.as_of = pd.Timestamp(as_of if as_of is not None else datetime.today())
+
+        # --- Active edges, one per replaced agent (latest start wins) ---
+        start = pd.to_datetime(
+            substitutions_df["ReplacementStartDate"], errors="coerce"
+        )
+        end = pd.to_datetime(substitutions_df["ReplacementEndDate"], errors="coerce")
+        # Missing dates never match, as an empty "Fin de Reemplazo" in the
+        # workbook; sources without dates give open bounds explicitly.
+        active = (start <= self.as_of) & (self.as_of <= end)
+        active_df = (
+            substitutions_df.assign(ReplacementStartDate=start)
+            .loc[active]
+            .sort_values("ReplacementStartDate", kind="mergesort")
+            .drop_duplicates(subset="reuc_old_id", keep="last")
+        )
+        edges = dict(zip(active_df["reuc_old_id"], active_df["reuc_new_id"]))
+        self.names = dict(zip(active_df["reuc_new_id"], active_df["reuc_new_name"]))
+
+        self.holders = self._resolve(edges)
+
+    @staticmethod
+    def _resolve(edges: dict) -> dict:
+        # Each id is visited once: the chain walked from an unresolved id is
+        # assigned its final holder on the way back.
+        holders = {}
+        for reuc_id in edges:
+            path = []
+            on_path = set()
+            node = reuc_id
+            while node in edges and node not in holders:
+                if node in on_path:
+                    cycle = " -> ".join(str(x) for x in path[path.index(node) :])
+                    raise ValueError(
+                        f"REUC substitution cycle detected: {cycle} -> {node}"
+                    )
+                path.append(node)
+                on_path.add(node)
+                node = edges[node]
+            final = holders.get(node, node)
+            for visited in path:
+                holders[visited] = final
+        return holders
+
+    def __len__(self) -> int:
+        return len(self.holders)
+
+    def __contains__(self, reuc_id) -> bool:
+        return reuc_id in self.holders
+
+    def lookup(self, reuc_id):
+        """Return the final active holder of `reuc_id` (itself when not substituted)."""
+        return self.holders.get(reuc_id, reuc_id)
+
+    def as_series(self) -> pd.Series:
+        """Holders as a Series indexed by replaced id, ready for `Series.map`."""
+        return pd.Series(self.holders)
 
 
 class REUCDataProcessor:
 
-    def __init__(self, folder: Path = Path("input")):
+    def __init__(
+        self,
+        folder: Path = Path("input"),
+        checkpoints: CheckpointStore | None = None,
+        source: ReucSource | None = None,
+    ):
         self.folder = folder
-
-        self.agents_file_path = self.pick_latest("datos_empresas_*.xlsx")
-        self.substitutions_file_path = self.pick_latest("datos_reuc_reemplazos_*.xlsx")
-
-        if self.agents_file_path is None:
-            raise FileNotFoundError("No matching 'datos_empresas_*.xlsx' file found.")
-
-        if self.substitutions_file_path is None:
-            raise FileNotFoundError(
-                "No matching 'datos_reuc_reemplazos_*.xlsx' file found."
-            )
-
-    def pick_latest(self, pattern: str) -> Path | None:
-        files = list(self.folder.glob(pattern))
-        if not files:
-            return None
-        return max(files, key=lambda x: x.stat().st_mtime)
+        # Default: daily snapshot of the REUC API, or the workbooks in `folder`
+        self.source = source or default_source(folder, checkpoints)
 
     def load_reuc_data(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Agents and substitutions of the source, typed by the REUC schemas."""
+        return self.source.load()
 
-        # --- Load Agents ---
-        try:
-            agents_df = pd.read_excel(self.agents_file_path, sheet_name="Empresas")
-        except ValueError as e:
-            raise ValueError(
-                f"Sheet 'Empresas' not found in {self.agents_file_path}"
-            ) from e
-
-        # --- Load Substitutions (first sheet) ---
-        substitutions_df = pd.read_excel(self.substitutions_file_path)
-
-        # Rename columns
-        agents_df = agents_df.rename(
-            columns={
-                "id": "reuc_id",
-                "Razón Social": "reuc_name",
-                "Segmento": "reuc_category",
-            }
-        )[["reuc_id", "reuc_name", "reuc_category"]]
-
-        substitutions_df = substitutions_df.rename(
-            columns={
-                "ID": "reuc_old_id",
-                "Empresa": "reuc_old_name",
-                "Rut": "reuc_old_rut",
-                "ID Reemplazo": "reuc_new_id",
-                "Reemplazada Por": "reuc_new_name",
-                "Rut Reemplazante": "reuc_new_rut",
-                "Inicio Reemplazo": "ReplacementStartDate",
-                "Fin de Reemplazo": "ReplacementEndDate",
-            }
-        )[
-            [
-                "reuc_old_id",
-                "reuc_old_name",
-                "reuc_old_rut",
-                "reuc_new_id",
-                "reuc_new_name",
-                "reuc_new_rut",
-                "ReplacementStartDate",
-                "ReplacementEndDate",
-            ]
-        ]
-
-        return agents_df, substitutions_df
+    def build_substitution_index(
+        self, substitutions_df: pd.DataFrame, as_of: datetime | None = None
+    ) -> SubstitutionIndex:
+        """Build the substitution graph once so consumers stop rescanning the frame."""
+        return SubstitutionIndex(substitutions_df, as_of)
 
     def get_agents_after_substitution(
-        self, agents_df: pd.DataFrame, substitutions_df: pd.DataFrame
+        self,
+        agents_df: pd.DataFrame,
+        substitutions: pd.DataFrame | SubstitutionIndex,
+        as_of: datetime | None = None,
     ):
-        # Create a new DataFrame with agents with their substitutions,
-        # only when datetime.today() is within the substitution period.
-        from datetime import datetime
-
-        updated_agents_df = agents_df.copy()
-
-        for index, row in updated_agents_df.iterrows():
-            reuc_id = row["reuc_id"]
-            substitution_rows = substitutions_df[
-                substitutions_df["reuc_old_id"] == reuc_id
-            ]
-
-            for _, sub_row in substitution_rows.iterrows():
-                replacement_start = sub_row["ReplacementStartDate"]
-                replacement_end = sub_row["ReplacementEndDate"]
-
-                if (
-                    datetime.today() >= replacement_start
-                    and datetime.today() <= replacement_end
-                ):
-                    reuc_new_id = sub_row["reuc_new_id"]
-                    reuc_new_name = sub_row["reuc_new_name"]
-
-                    updated_agents_df.at[index, "reuc_id"] = reuc_new_id
-                    updated_agents_df.at[index, "reuc_name"] = reuc_new_name
-
-                    print(f"Agent {row['reuc_name']} is under REUC substitution.")
+        # Create a new DataFrame with agents replaced by their final active holder,
+        # following substitution chains (A -> B -> C) as of `as_of` (default: today).
+        return self.resolve_substitutions(agents_df, agents_df, substitutions, as_of)
+
+    def resolve_substitutions(
+        self,
+        units_df: pd.DataFrame,
+        agents_df: pd.DataFrame,
+        substitutions: pd.DataFrame | SubstitutionIndex,
+        as_of: datetime | None = None,
+        id_column: str = "reuc_id",
+        name_column: str = "reuc_name",
+    ) -> pd.DataFrame:
+        """Apply the substitutions active at `as_of` to all `units_df` rows at once."""
+        if isinstance(substitutions, pd.DataFrame):
+            substitutions = self.build_substitution_index(substitutions, as_of)
+
+        # --- Pre-indexed agents table ---
+        names = agents_df.drop_duplicates(subset="reuc_id").set_index("reuc_id")[
+            "reuc_name"
+        ]
 
-        return updated_agents_df
+        resolved_df = units_df.copy()
+        new_ids = resolved_df[id_column].map(substitutions.as_series())
+        mask = new_ids.notna()
+        if not mask.any():
+            return resolved_df
+
+        new_names = (
+            new_ids[mask]
+            .map(names)
+            .fillna(new_ids[mask].map(pd.Series(substitutions.names, dtype=object)))
+        )
+        resolved_df.loc[mask, id_column] = new_ids[mask].astype(
+            resolved_df[id_column].dtype
+        )
+        resolved_df.loc[mask, name_column] = new_names
+
+        print(f"{mask.sum()} rows are under REUC substitution.")
+        return resolved_df
 
     def get_pmgd_agents(self, agents_df: pd.DataFrame) -> pd.DataFrame:
         # Filter agents that contain "PMGD", within the string,  in the field "reuc_category"
@@ -114,7 +146,6 @@ class REUCDataProcessor:
 
 
 if __name__ == "__main__":
-    from datetime import datetime
     import os
 
     os.system("cls" if os.name == "nt" else "clear")
@@ -1,37 +1,102 @@
-import requests
-import api_key
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import openpyxl
-
-
-class ApiClient:
-    def __init__(self, base_url, api_key):
-        self.base_url = base_url
-        self.api_key = api_key
+from pathlib import Path
+import requests
+from api_client import ApiClient
+from http_cache import ResponseCache
+from reuc_key import to_reuc_ids
 
 
 class ReucApiClient(ApiClient):
+    coordinados_path = "v1/coordinados"
+    empresas_path = "v1/empresas"
+    # Missing empresas are cached too, so they are not requested on every run.
+    cached_statuses = (200, 404)
+
     def __init__(
         self,
-        base_url: str = "https://citizen-cen-api.apps.prod-os-1.coordinador.cl/reuc/v1/coordinados",
+        base_url: str = "https://citizen-cen-api.apps.prod-os-1.coordinador.cl/reuc",
         api_key: str = None,
+        cache: ResponseCache | None = None,
+        empresa_ttl: float = 7 * 86400,
+        **kwargs,
     ):
-        super().__init__(base_url, api_key)
+        # Empresas change rarely: each one is cached for `empresa_ttl` seconds.
+        self.empresa_ttl = empresa_ttl
+        cache = cache or ResponseCache(Path("cache/reuc"))
+        super().__init__(base_url, api_key, cache=cache, **kwargs)
 
-    def fetch_json(self):
-        response = requests.get(
-            self.base_url, params={"user_key": self.api_key}, timeout=30, verify=False
+    def fetch_json(
+        self, url: str = "", params: dict | None = None, ttl: float | None = None
+    ):
+        return super().fetch_json(
+            url, {"user_key": self.api_key, **(params or {})}, ttl
         )
-        response.raise_for_status()
-        return response.json()
 
     def get_agents(self):
-        agents_df = pd.json_normalize(self.fetch_json())
+        agents_df = pd.json_normalize(self.fetch_json(self.coordinados_path))
+        # REUC ids as integer keys, like the workbooks and Infotécnica grupos
+        for column in ["id", "reemplazoId"]:
+            if column in agents_df:
+                agents_df[column] = to_reuc_ids(agents_df[column], column)
         return agents_df
 
+    def get_empresa(self, reuc_id: int) -> dict | None:
+        """One empresa from `/v1/empresas/{idReuc}`, or None if it does not exist."""
+        try:
+            return self.fetch_json(
+                f"{self.empresas_path}/{reuc_id}", ttl=self.empresa_ttl
+            )
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    def get_empresas(self, reuc_ids, max_workers: int = 16) -> pd.DataFrame:
+        """Empresas of `reuc_ids` (with full contacts), one normalized row per id.
+
+        Each distinct id is requested once, at most `max_workers` at a time, and
+        served from the cache while younger than `empresa_ttl`, as is the 404 of
+        an id that does not exist. IDs that do not exist or fail are reported
+        and left out.
+        """
+        ids = to_reuc_ids(pd.Series(list(reuc_ids)), "idReuc").dropna().unique()
+        ids = [int(reuc_id) for reuc_id in ids]
+
+        records, errors = [], {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                reuc_id: executor.submit(self.get_empresa, reuc_id) for reuc_id in ids
+            }
+            for reuc_id, future in futures.items():
+                try:
+                    record = future.result()
+                except requests.RequestException as e:
+                    errors[reuc_id] = e
+                    continue
+                if record is None:
+                    errors[reuc_id] = "not found"
+                else:
+                    records.append(record)
+
+        if errors:
+            details = "; ".join(f"{reuc_id}: {e}" for reuc_id, e in errors.items())
+            print(
+                f"{len(errors)} of {len(ids)} empresas could not be fetched: {details}"
+            )
+
+        # Nested contacts become "gerente.mail", ...; "reemplazo" stays one level
+        empresas_df = pd.json_normalize(records, max_level=1)
+        for column in ["id", "reemplazoId", "reemplazo.id"]:
+            if column in empresas_df:
+                empresas_df[column] = to_reuc_ids(empresas_df[column], column)
+        return empresas_df
+
 
 if __name__ == "__main__":
+    import api_key
+
     client = ReucApiClient(api_key=api_key.reuc_api_key)
     data = client.get_agents()
 
@@ -0,0 +1,38 @@
+import pandas as pd
+
+# Integer REUC key shared by Infotécnica grupos, the REUC workbooks and the
+# REUC API, so every join on it is an integer hash join.
+REUC_ID = pd.Int64Dtype()
+
+# "<name>_<id>" in the descripcion of Infotécnica grupos
+DESCRIPCION_ID = r"(?:^|_)\s*(\d+)\s*$"
+
+
+def parse_descripcion_ids(descripcion: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """REUC id at the end of every grupo `descripcion`.
+
+    Returns the ids (NA where there is none) and the mask of descriptions
+    that are present but do not end in an id, so they can be reported.
+    """
+    text = descripcion.astype("string")
+    ids = text.str.extract(DESCRIPCION_ID, expand=False)
+    malformed = text.notna() & ids.isna()
+    return ids.astype(REUC_ID), malformed
+
+
+def to_reuc_ids(values: pd.Series, label: str = "REUC id") -> pd.Series:
+    """Convert `values` to REUC keys, reporting those that are not integers.
+
+    Values that are not whole numbers become NA; they are printed with
+    `label` instead of being dropped silently.
+    """
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype(REUC_ID)
+
+    numbers = pd.to_numeric(values, errors="coerce")
+    malformed = numbers.notna() & (numbers % 1 != 0)
+    malformed |= values.notna() & numbers.isna()
+    if malformed.any():
+        examples = values[malformed].drop_duplicates().head(5).tolist()
+        print(f"{malformed.sum()} {label} values are not valid REUC ids: {examples}")
+    return numbers.where(~malformed).astype(REUC_ID)
@@ -0,0 +1,242 @@
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from checkpoints import CheckpointStore
+from reuc_api import ReucApiClient
+from reuc_key import to_reuc_ids
+from schemas import REUC_AGENTS, REUC_SUBSTITUTIONS
+
+# Bounds of the substitutions known to be in force but given without dates
+OPEN_START = pd.Timestamp.min
+OPEN_END = pd.Timestamp.max
+
+
+def to_category(names) -> str | None:
+    """REUC category of an agent: its distinct category names, sorted, ", "-joined.
+
+    The workbooks give them as one "Segmento" string and the API as the names
+    of the `subcategorias`; both are brought to this form so the sources agree.
+    """
+    if isinstance(names, str):
+        names = names.replace(";", ",").split(",")
+    elif not isinstance(names, list):
+        return None
+    names = sorted({name.strip() for name in names if isinstance(name, str)} - {""})
+    return ", ".join(names) or None
+
+
+class ReucSource(ABC):
+    """Where REUCDataProcessor gets the REUC agents and substitutions from.
+
+    Every source returns the same two frames, typed by the REUC_AGENTS and
+    REUC_SUBSTITUTIONS schemas, so consumers do not care which one is used.
+    """
+
+    @abstractmethod
+    def load(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """The agents and substitutions frames."""
+
+    @abstractmethod
+    def version(self) -> str:
+        """Token that changes whenever `load` may return different data."""
+
+
+class XlsxReucSource(ReucSource):
+    """The `datos_empresas_*.xlsx` and `datos_reuc_reemplazos_*.xlsx` downloads."""
+
+    def __init__(
+        self, folder: Path = Path("input"), checkpoints: CheckpointStore | None = None
+    ):
+        self.folder = Path(folder)
+        # Parsed workbooks are checkpointed, so each file is read by openpyxl once.
+        self.checkpoints = checkpoints or CheckpointStore()
+
+        self.agents_file_path = self.pick_latest("datos_empresas_*.xlsx")
+        self.substitutions_file_path = self.pick_latest("datos_reuc_reemplazos_*.xlsx")
+
+        if self.agents_file_path is None:
+            raise FileNotFoundError("No matching 'datos_empresas_*.xlsx' file found.")
+
+        if self.substitutions_file_path is None:
+            raise FileNotFoundError(
+                "No matching 'datos_reuc_reemplazos_*.xlsx' file found."
+            )
+
+    def pick_latest(self, pattern: str) -> Path | None:
+        files = list(self.folder.glob(pattern))
+        if not files:
+            return None
+        return max(files, key=lambda x: x.stat().st_mtime)
+
+    def version(self) -> str:
+        files = [self.agents_file_path, self.substitutions_file_path]
+        return "; ".join(f"{path} @ {path.stat().st_mtime_ns}" for path in files)
+
+    def load(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+
+        # --- Load Agents ---
+        try:
+            agents_df = self.checkpoints.read_excel(
+                self.agents_file_path, sheet_name="Empresas"
+            )
+        except ValueError as e:
+            raise ValueError(
+                f"Sheet 'Empresas' not found in {self.agents_file_path}"
+            ) from e
+
+        # --- Load Substitutions (first sheet) ---
+        substitutions_df = self.checkpoints.read_excel(self.substitutions_file_path)
+
+        # Rename columns, keep and type those of the schemas
+        agents_df = agents_df.rename(
+            columns={
+                "id": "reuc_id",
+                "Razón Social": "reuc_name",
+                "Segmento": "reuc_category",
+            }
+        )
+        agents_df["reuc_id"] = to_reuc_ids(agents_df["reuc_id"], "Empresas id")
+        agents_df["reuc_category"] = agents_df["reuc_category"].map(to_category)
+        agents_df = REUC_AGENTS.apply(agents_df)
+
+        substitutions_df = substitutions_df.rename(
+            columns={
+                "ID": "reuc_old_id",
+                "Empresa": "reuc_old_name",
+                "Rut": "reuc_old_rut",
+                "ID Reemplazo": "reuc_new_id",
+                "Reemplazada Por": "reuc_new_name",
+                "Rut Reemplazante": "reuc_new_rut",
+                "Inicio Reemplazo": "ReplacementStartDate",
+                "Fin de Reemplazo": "ReplacementEndDate",
+            }
+        )
+        for column, label in [("reuc_old_id", "ID"), ("reuc_new_id", "ID Reemplazo")]:
+            substitutions_df[column] = to_reuc_ids(substitutions_df[column], label)
+        substitutions_df = REUC_SUBSTITUTIONS.apply(substitutions_df)
+
+        return agents_df, substitutions_df
+
+
+class ApiReucSource(ReucSource):
+    """The coordinados list of the REUC API, read live on every `load`."""
+
+    def __init__(self, client: ReucApiClient):
+        self.client = client
+
+    def version(self) -> str:
+        return datetime.now().isoformat()
+
+    def load(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        coordinados_df = self.client.get_agents().reindex(
+            columns=["id", "razonSocial", "rut", "subcategorias", "reemplazoId"]
+        )
+
+        # The API has no "Segmento": the category is made of the names of the
+        # agent's subcategorías, in the same form as the workbook's.
+        categories = coordinados_df["subcategorias"].map(
+            lambda subcategorias: (
+                to_category([s.get("name") for s in subcategorias])
+                if isinstance(subcategorias, list)
+                else None
+            )
+        )
+        agents_df = REUC_AGENTS.apply(
+            pd.DataFrame(
+                {
+                    "reuc_id": coordinados_df["id"],
+                    "reuc_name": coordinados_df["razonSocial"],
+                    "reuc_category": categories,
+                }
+            )
+        )
+
+        # The API only tells the current replacement of each agent, without
+        # dates: its substitutions are in force from OPEN_START to OPEN_END.
+        by_id = coordinados_df.drop_duplicates(subset="id").set_index("id")
+        replaced_df = coordinados_df[coordinados_df["reemplazoId"].notna()]
+        new_ids = replaced_df["reemplazoId"]
+        substitutions_df = REUC_SUBSTITUTIONS.apply(
+            pd.DataFrame(
+                {
+                    "reuc_old_id": replaced_df["id"],
+                    "reuc_old_name": replaced_df["razonSocial"],
+                    "reuc_old_rut": replaced_df["rut"],
+                    "reuc_new_id": new_ids,
+                    "reuc_new_name": new_ids.map(by_id["razonSocial"]),
+                    "reuc_new_rut": new_ids.map(by_id["rut"]),
+                    "ReplacementStartDate": OPEN_START,
+                    "ReplacementEndDate": OPEN_END,
+                }
+            ).reset_index(drop=True)
+        )
+
+        return agents_df, substitutions_df
+
+
+class SnapshotReucSource(ReucSource):
+    """Columnar snapshot of another source, refreshed when older than `ttl`.
+
+    When the refresh fails (e.g. the API is down) and a snapshot exists, the
+    stale snapshot is used and reported.
+    """
+
+    names = ("reuc_agents", "reuc_substitutions")
+
+    def __init__(
+        self,
+        source: ReucSource,
+        folder: Path = Path("cache/reuc_snapshot"),
+        ttl: float = 24 * 3600,
+    ):
+        self.source = source
+        self.store = CheckpointStore(folder)
+        self.ttl = ttl
+
+    def fetched_at(self) -> float | None:
+        """Modification time of the stored snapshot, None if there is none."""
+        paths = [self.store.path(name) for name in self.names]
+        if any(path is None for path in paths):
+            return None
+        return min(path.stat().st_mtime for path in paths)
+
+    def refresh(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        frames = self.source.load()
+        for name, df in zip(self.names, frames):
+            self.store.save(name, df)
+        return frames
+
+    def ensure_fresh(self):
+        fetched_at = self.fetched_at()
+        if fetched_at is not None and time.time() - fetched_at < self.ttl:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            if fetched_at is None:
+                raise
+            print(f"REUC snapshot could not be refreshed, using the stale one: {e}")
+
+    def version(self) -> str:
+        self.ensure_fresh()
+        return datetime.fromtimestamp(self.fetched_at()).isoformat()
+
+    def load(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        self.ensure_fresh()
+        return tuple(self.store.load(name) for name in self.names)
+
+
+def default_source(
+    folder: Path = Path("input"), checkpoints: CheckpointStore | None = None
+) -> ReucSource:
+    """Daily snapshot of the REUC API, or the xlsx downloads without an API key."""
+    try:
+        import api_key
+    except ImportError:
+        return XlsxReucSource(folder, checkpoints)
+    return SnapshotReucSource(
+        ApiReucSource(ReucApiClient(api_key=api_key.reuc_api_key))
+    )
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+
+import pandas as pd
+from reuc_key import REUC_ID
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Fields kept from an endpoint or workbook, with the dtype of each one.
+
+    Integer dtypes should be nullable ("Int64"), so missing IDs do not turn a
+    column into floats; repeated labels are best kept as "category".
+    """
+
+    dtypes: dict
+
+    @property
+    def fields(self) -> list:
+        return list(self.dtypes)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Project `df` to the schema fields (missing ones are NA) and cast them."""
+        df = df.reindex(columns=self.fields)
+        for field, dtype in self.dtypes.items():
+            column = df[field]
+            if pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(dtype)):
+                if not pd.api.types.is_numeric_dtype(column):
+                    column = pd.to_numeric(column, errors="coerce")
+                df[field] = column.astype(dtype)
+            elif dtype == "datetime64[ns]":
+                # Offsets (mixed, or "Z") are read as UTC and dropped, so the
+                # column stays naive whatever the feed sends.
+                column = pd.to_datetime(column, errors="coerce", utc=True)
+                df[field] = column.dt.tz_convert(None).astype(dtype)
+            else:
+                df[field] = column.astype(dtype)
+        return df
+
+
+# --- Infotécnica lists used by the PMGD pipeline ---
+GRUPOS = Schema({"id": "Int64", "descripcion": "string"})
+
+CENTRALES = Schema(
+    {
+        "id": "Int64",
+        "nombre": "string",
+        "id_coordinado": "Int64",
+        "coordinado_nombre": "category",
+    }
+)
+
+UNIDADES_GENERADORAS = Schema(
+    {
+        "id": "Int64",
+        "id_central": "Int64",
+        "nombre": "string",
+        "tipo_tecnologia_nombre": "category",
+    }
+)
+
+# --- REUC workbooks, after renaming (see REUCDataProcessor.load_reuc_data) ---
+# REUC ids are converted with reuc_key.to_reuc_ids first, which reports
+# malformed ones.
+REUC_AGENTS = Schema(
+    {"reuc_id": REUC_ID, "reuc_name": "string", "reuc_category": "category"}
+)
+
+REUC_SUBSTITUTIONS = Schema(
+    {
+        "reuc_old_id": REUC_ID,
+        "reuc_old_name": "string",
+        "reuc_old_rut": "string",
+        "reuc_new_id": REUC_ID,
+        "reuc_new_name": "string",
+        "reuc_new_rut": "string",
+        "ReplacementStartDate": "datetime64[ns]",
+        "ReplacementEndDate": "datetime64[ns]",
+    }
+)
+
+# --- Neomante intervention-disconnection /v2 (InterventionDisconnectionDto) ---
+# Nested date objects are read through their "local" time.
+INTERVENCIONES_DESCONEXION = Schema(
+    {
+        "id": "string",
+        "correlativo": "string",
+        "status": "category",
+        "tipoSolicitud": "category",
+        "tipoProgramacion": "category",
+        "idEmpresa": "Int64",
+        "docEmpresa.empresaNombre": "category",
+        "idCentral": "Int64",
+        "docCentral.centralNombre": "string",
+        "idSubestacion": "Int64",
+        "idLinea": "Int64",
+        "elementoATrabajar": "category",
+        "idTipoTrabajo": "category",
+        "potencia": "float64",
+        "produceIndisponibilidad": "boolean",
+        "indisponeCentralCompleta": "boolean",
+        "trabajoRelevante": "boolean",
+        "fechaInicio.local": "datetime64[ns]",
+        "fechaFin.local": "datetime64[ns]",
+        "fechaEfectivaInicio.local": "datetime64[ns]",
+        "fechaEfectivaFin.local": "datetime64[ns]",
+        "created.local": "datetime64[ns]",
+        "modified.local": "datetime64[ns]",
+    }
+)
+
+# --- Neomante limitaciones and reporte-fallas /v2 (LimitationDto, ReportFailDto) ---
+LIMITACIONES = Schema(
+    {
+        "id": "string",
+        "correlativo": "Int64",
+        "status": "category",
+        "type": "category",
+        "idEmpresa": "Int64",
+        "docEmpresa.empresaNombre": "category",
+        "idCentral": "Int64",
+        "docCentral.centralNombre": "string",
+        "idUnidad": "Int64",
+        "idSubestacion": "Int64",
+        "idLinea": "Int64",
+        "elementoATrabajar": "category",
+        "estadoOperativo": "category",
+        "potencia": "float64",
+        "unidadMedidaPotencia": "category",
+        "indisponeCentralCompleta": "boolean",
+        "fechaPerturbacion": "datetime64[ns]",
+        "fechaRetornoEstimada": "datetime64[ns]",
+        "fechaEfectivaRetorno": "datetime64[ns]",
+        "created": "datetime64[ns]",
+        "modified": "datetime64[ns]",
+    }
+)
+
+REPORTE_FALLAS = Schema(
+    {
+        "id": "string",
+        "correlativo": "Int64",
+        "status": "category",
+        "type": "category",
+        "idEmpresa": "Int64",
+        "docEmpresa.empresaNombre": "category",
+        "idCentral": "Int64",
+        "docCentral.centralNombre": "string",
+        "idSubestacion": "Int64",
+        "idLinea": "Int64",
+        "elementoAtrabajar": "category",
+        "estadoOperativo": "category",
+        "causa": "string",
+        "tipoCausa": "category",
+        "tipoPerdidaPotencia": "category",
+        "produceIndisponibilidad": "boolean",
+        "indisponeCentralCompleta": "boolean",
+        "fechaPerturbacion": "datetime64[ns]",
+        "fechaRetornoEstimada": "datetime64[ns]",
+        "fechaEfectivaRetorno": "datetime64[ns]",
+        "created": "datetime64[ns]",
+        "modified": "datetime64[ns]",
+    }
+)
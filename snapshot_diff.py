@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNA = "Columna"
+ANTERIOR = "Valor anterior"
+NUEVO = "Valor nuevo"
+OCURRENCIA = "Ocurrencia"
+
+
+@dataclass
+class SnapshotDiff:
+    """Rows added, removed and modified between two snapshots of a table.
+
+    `modified` has one row per changed cell: the key columns, "Columna",
+    "Valor anterior" and "Valor nuevo".
+    """
+
+    key: list
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    modified: pd.DataFrame
+
+    def summary(self) -> str:
+        changed_rows = len(self.modified.drop_duplicates(subset=self.key))
+        return (
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{changed_rows} modified rows ({len(self.modified)} changed values)"
+        )
+
+    def to_excel(self, file: Path) -> Path:
+        with pd.ExcelWriter(file) as writer:
+            self.added.to_excel(writer, sheet_name="Nuevos", index=False)
+            self.removed.to_excel(writer, sheet_name="Eliminados", index=False)
+            self.modified.to_excel(writer, sheet_name="Modificados", index=False)
+        return Path(file)
+
+
+def keyed(df: pd.DataFrame, key: list) -> pd.DataFrame:
+    """`df` indexed by `key`, which has to identify its rows."""
+    df = df.set_index(key)
+    if not df.index.is_unique:
+        duplicated = df.index[df.index.duplicated()].unique()[:5].tolist()
+        raise ValueError(f"Duplicated keys {key} in snapshot, e.g. {duplicated}")
+    return df
+
+
+def number_duplicates(df: pd.DataFrame, key: list, label: str) -> pd.DataFrame:
+    """`df` with an "Ocurrencia" column numbering the rows that share `key`.
+
+    Duplicated keys are reported rather than dropped: with the occurrence
+    appended, the key identifies every row, and rows sharing a key are
+    compared in order of appearance.
+    """
+    duplicated = df.duplicated(subset=key, keep=False)
+    if duplicated.any():
+        print(f"{label}: {duplicated.sum()} rows share their key {key}:")
+        print(df.loc[duplicated, key].drop_duplicates().to_string(index=False))
+    occurrence = df.groupby(key, sort=False, dropna=False).cumcount()
+    return df.assign(**{OCURRENCIA: occurrence})
+
+
+def harmonize(old: pd.Series, new: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Give both versions of a column a common dtype before comparing them.
+
+    Snapshots read from Excel and from columnar files type the same values
+    differently (e.g. "220" and 220.0); numbers are compared as numbers when
+    both sides convert without losing values, anything else as text.
+    """
+    numeric = pd.api.types.is_numeric_dtype
+    if numeric(old) and numeric(new):
+        return old.astype(float), new.astype(float)
+    if numeric(old) or numeric(new):
+        old_num = pd.to_numeric(old, errors="coerce")
+        new_num = pd.to_numeric(new, errors="coerce")
+        if old_num.isna().sum() == old.isna().sum() and (
+            new_num.isna().sum() == new.isna().sum()
+        ):
+            return old_num.astype(float), new_num.astype(float)
+    return old.astype("string"), new.astype("string")
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of every row of `df`, independent of its index."""
+    return pd.util.hash_pandas_object(df, index=False, categorize=False).to_numpy()
+
+
+def diff_snapshots(
+    old_df: pd.DataFrame,
+    new_df: pd.DataFrame,
+    key,
+    columns: list | None = None,
+) -> SnapshotDiff:
+    """Compare two snapshots of a table by `key` (a column or list of columns).
+
+    Rows are matched through the key index rather than an outer merge. Rows
+    of both snapshots are compared through hashed fingerprints of `columns`
+    (default: the columns both snapshots share), and only those whose
+    fingerprint differs are compared column by column.
+    """
+    key = [key] if isinstance(key, str) else list(key)
+    old = keyed(old_df, key)
+    new = keyed(new_df, key)
+    if columns is None:
+        columns = [column for column in new.columns if column in old.columns]
+
+    added = new_df[~new.index.isin(old.index)].reset_index(drop=True)
+    removed = old_df[~old.index.isin(new.index)].reset_index(drop=True)
+
+    common = new.index.intersection(old.index, sort=False)
+    old_common = pd.DataFrame(index=common)
+    new_common = pd.DataFrame(index=common)
+    for column in columns:
+        old_common[column], new_common[column] = harmonize(
+            old[column].reindex(common), new[column].reindex(common)
+        )
+
+    changed = row_fingerprints(old_common) != row_fingerprints(new_common)
+    old_changed = old_common[changed]
+    new_changed = new_common[changed]
+
+    modified = []
+    for column in columns:
+        before, after = old_changed[column], new_changed[column]
+        differs = (before != after).fillna(True) & ~(before.isna() & after.isna())
+        if differs.any():
+            modified.append(
+                pd.DataFrame(
+                    {
+                        COLUMNA: column,
+                        ANTERIOR: before[differs].astype(object),
+                        NUEVO: after[differs].astype(object),
+                    }
+                )
+            )
+    if modified:
+        modified = pd.concat(modified).reset_index()
+    else:
+        modified = pd.DataFrame(columns=[*key, COLUMNA, ANTERIOR, NUEVO])
+    return SnapshotDiff(key, added, removed, modified)
@@ -0,0 +1,14 @@
+import pytest
+from api_client import ApiClient
+
+
+def test_host_limit_is_set_once():
+    first = ApiClient("http://limit.test", pool_size=3)
+    assert first.host_slots("limit.test")._value == 3
+
+    # Without an explicit limit, later clients share the existing one.
+    second = ApiClient("http://limit.test", pool_size=9)
+    assert second.host_slots("limit.test") is first.host_slots("limit.test")
+
+    with pytest.raises(ValueError, match="limited to 3"):
+        ApiClient("http://limit.test", max_per_host=5).host_slots("limit.test")
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from bay_index import COINCIDENCIA, CONFIANZA, PANO, SUBESTACION, BayIndex
+
+# Bay J1 of Charrúa has two CTs (interruptor y medio)
+TTCC = pd.DataFrame(
+    {
+        "id": [1, 2, 3],
+        "pano_nombre": ["S/E CHARRUA J1", "S/E CHARRUA J1", "S/E ALTO JAHUEL J5"],
+    }
+)
+
+
+def bays(*keys) -> pd.DataFrame:
+    return pd.DataFrame(keys, columns=[SUBESTACION, PANO])
+
+
+def test_exact_hit():
+    result = BayIndex(TTCC).match(bays(("ALTO JAHUEL", "J5")))
+
+    assert result[COINCIDENCIA].tolist() == ["exacta"]
+    assert result[CONFIANZA].tolist() == [1.0]
+    assert result["id"].tolist() == [3]
+
+
+def test_approximate_hit_above_threshold():
+    result = BayIndex(TTCC).match(bays(("ALTO JAHUELL", "J5")))
+
+    assert result[COINCIDENCIA].tolist() == ["aproximada"]
+    assert 0.85 <= result[CONFIANZA][0] < 1
+    assert result[f"{SUBESTACION}_IT"].tolist() == ["ALTO JAHUEL"]
+    assert result["id"].tolist() == [3]
+
+
+def test_approximate_hit_below_threshold_is_rejected():
+    index = BayIndex(TTCC, min_confidence=0.99)
+    result = index.match(bays(("ALTO JAHUELL", "J5"), ("POLPAICO", "J2")))
+
+    assert result[COINCIDENCIA].isna().all()
+    assert result[CONFIANZA].isna().all()
+    assert result["id"].isna().all()
+
+
+@pytest.mark.parametrize(
+    "policy, ids", [("first", [1]), ("last", [2]), ("all", [1, 2])]
+)
+def test_policy_on_bay_with_several_cts(policy, ids):
+    result = BayIndex(TTCC, policy=policy).match(bays(("CHARRUA", "J1")))
+
+    assert result["id"].tolist() == ids
+    assert (result[COINCIDENCIA] == "exacta").all()
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError, match="Unknown CT policy"):
+        BayIndex(TTCC, policy="middle")
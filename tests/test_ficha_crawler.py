@@ -0,0 +1,42 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from api_client import ApiClient
+from ficha_crawler import FichaCrawler
+
+
+@pytest.fixture
+def server():
+    requests_by_id = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            id = self.path.split("/")[2]
+            requests_by_id[id] = requests_by_id.get(id, 0) + 1
+            status, body = (500, b"") if id == "9" else (200, b'{"id": 1}')
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}", requests_by_id
+    httpd.shutdown()
+
+
+def test_failures_are_retried_by_the_session_only(server):
+    base_url, requests_by_id = server
+    client = ApiClient(base_url, max_retries=2, backoff_factor=0, backoff_jitter=0)
+    fichas, failures = FichaCrawler(client).crawl("centrales", [1, 9], "general")
+
+    assert json.dumps(fichas[1]) == '{"id": 1}'
+    assert requests_by_id == {"1": 1, "9": 3}
+    assert failures.to_dict("records") == [
+        {"id": 9, "status": 500, "error": "Internal Server Error", "attempts": 3}
+    ]
@@ -0,0 +1,32 @@
+import pandas as pd
+from ficha_crawler import FichaCrawler
+from ficha_snapshots import FichaSnapshotStore, pivot_fichas
+
+
+class StubCrawler(FichaCrawler):
+    """Crawler answering every ID with a one-category ficha."""
+
+    def __init__(self):
+        self.crawled = []
+
+    def crawl(self, resource, ids_list, ficha_type):
+        self.crawled.extend(ids_list)
+        fichas = {id: {"nombre": {"valor_texto": f"Tramo {id}"}} for id in ids_list}
+        return fichas, pd.DataFrame(columns=["id", "status", "error", "attempts"])
+
+
+def test_removed_ids_leave_the_snapshot(tmp_path):
+    store = FichaSnapshotStore(tmp_path)
+    crawler = StubCrawler()
+    crawler.fetch_categories(
+        "secciones-tramos", [1, 2], ["nombre"], "general", store=store
+    )
+
+    df, _ = crawler.fetch_categories(
+        "secciones-tramos", [1], ["nombre"], "general", store=store
+    )
+
+    assert crawler.crawled == [1, 2]
+    assert df["nombre"].tolist() == ["Tramo 1"]
+    values_df = store.values("secciones-tramos", "general")
+    assert pivot_fichas(values_df, ["nombre"])["id"].tolist() == ["1"]
@@ -0,0 +1,105 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from api_client import ApiClient
+from http_cache import ResponseCache
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+@pytest.fixture
+def server():
+    """Serves /etag with an ETag, /dated with Last-Modified; 304 when unchanged."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append((self.path, dict(self.headers)))
+            if self.path.startswith("/etag"):
+                unchanged = self.headers.get("If-None-Match") == '"v1"'
+                validator = ("ETag", '"v1"')
+            else:
+                unchanged = self.headers.get("If-Modified-Since") == LAST_MODIFIED
+                validator = ("Last-Modified", LAST_MODIFIED)
+            body = b"" if unchanged else b'{"value": 1}'
+            self.send_response(304 if unchanged else 200)
+            self.send_header(*validator)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}", seen
+    httpd.shutdown()
+
+
+@pytest.mark.parametrize(
+    "path, header", [("etag", "If-None-Match"), ("dated", "If-Modified-Since")]
+)
+def test_stale_entries_are_revalidated(server, tmp_path, path, header):
+    base_url, seen = server
+    client = ApiClient(base_url, cache=ResponseCache(tmp_path, default_ttl=0))
+
+    assert client.fetch_json(path) == {"value": 1}
+    assert client.fetch_json(path) == {"value": 1}
+
+    assert len(seen) == 2
+    assert header not in seen[0][1] and header in seen[1][1]
+
+
+def test_fresh_entries_are_not_requested(server, tmp_path):
+    base_url, seen = server
+    client = ApiClient(base_url, cache=ResponseCache(tmp_path))
+
+    client.fetch_json("etag")
+    client.fetch_json("etag")
+
+    assert len(seen) == 1
+
+
+def test_offline_mode_serves_stale_entries_only(server, tmp_path):
+    base_url, seen = server
+    cache = ResponseCache(tmp_path, default_ttl=0)
+    client = ApiClient(base_url, cache=cache)
+    client.fetch_json("etag")
+
+    cache.offline = True
+    assert client.fetch_json("etag") == {"value": 1}
+    with pytest.raises(requests.ConnectionError, match="Offline mode"):
+        client.fetch_json("dated")
+    assert len(seen) == 1
+
+
+def test_user_key_is_not_written_to_disk(server, tmp_path):
+    base_url, _ = server
+    client = ApiClient(base_url, cache=ResponseCache(tmp_path))
+
+    client.fetch_json("etag", {"user_key": "s3cr3t-key", "page": 1})
+
+    files = list(tmp_path.iterdir())
+    assert files
+    assert not any(b"s3cr3t-key" in path.read_bytes() for path in files)
+
+
+def test_least_recently_used_entries_are_evicted(server, tmp_path):
+    base_url, _ = server
+    cache = ResponseCache(tmp_path, max_bytes=30)  # Room for two 12-byte bodies
+    client = ApiClient(base_url, cache=cache)
+    client.get("etag/a")
+    client.get("etag/b")
+    for name, mtime in [("etag/a", 1000), ("etag/b", 2000)]:
+        os.utime(cache.lookup(f"{base_url}/{name}").body_path, (mtime, mtime))
+    cache.lookup(f"{base_url}/etag/a")  # a is now the most recently used
+
+    client.get("etag/c")
+
+    assert cache.lookup(f"{base_url}/etag/b") is None
+    assert cache.lookup(f"{base_url}/etag/a") is not None
+    assert cache.lookup(f"{base_url}/etag/c") is not None
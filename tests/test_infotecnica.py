@@ -0,0 +1,21 @@
+import pandas as pd
+from infotecnica import InfotecnicaClient
+
+RECORDS = [{"id": i} for i in range(25)]
+
+
+class CappedClient(InfotecnicaClient):
+    """Serves RECORDS in pages of at most 10, whatever page size is asked."""
+
+    cap = 10
+
+    def fetch_page_frame(self, resource, page, page_size=1000, fields=None, meta=None):
+        size = min(page_size, self.cap)
+        if meta is not None:
+            meta["count"] = len(RECORDS)
+        return pd.DataFrame(RECORDS[(page - 1) * size : page * size])
+
+
+def test_pages_follow_server_page_size():
+    df = CappedClient().get_data_by_pages("centrales", page_size=1000)
+    assert df["id"].tolist() == list(range(25))
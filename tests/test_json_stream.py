@@ -0,0 +1,31 @@
+import io
+
+import json_stream
+import pytest
+from json_stream import read_records
+
+PAGE = b'{"count": 3, "results": [{"id": 1, "a": {"b": [1]}}, {"id": 2}], "next": null}'
+LIST = b' [{"id": 1}, {"id": 2}]'
+
+
+@pytest.fixture(params=["ijson", "stdlib"])
+def decoder(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_stream, "ijson", None)
+    elif json_stream.ijson is None:
+        pytest.skip("ijson is not installed")
+
+
+def test_page_records_and_meta(decoder):
+    meta = {}
+    df = read_records(io.BytesIO(PAGE), ["id", "a.b"], meta=meta)
+
+    assert df["id"].tolist() == [1, 2]
+    assert df["a.b"].tolist() == [[1], None]
+    assert meta == {"count": 3, "next": None}
+
+
+def test_list_leaves_meta_empty(decoder):
+    meta = {}
+    assert read_records(io.BytesIO(LIST), meta=meta)["id"].tolist() == [1, 2]
+    assert meta == {}
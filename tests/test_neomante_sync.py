@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+import pandas as pd
+from neomante_api import LimitationApiClient
+from neomante_sync import IncrementalSync
+from schemas import LIMITACIONES
+
+
+class RecordingClient:
+    """Limitations client stand-in recording the ids re-read by `id_in`."""
+
+    service = "limitaciones"
+    schema = LIMITACIONES
+
+    def __init__(self):
+        self.requested = []
+
+    def get_records(self, **filters):
+        self.requested.extend(filters.get("id_in", []))
+        return self.schema.apply(pd.DataFrame({"id": filters.get("id_in", [])}))
+
+
+def stored(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["id", "status", "created"])
+    return LIMITACIONES.apply(df)
+
+
+def test_closed_and_old_open_records_are_not_reread(tmp_path):
+    client = RecordingClient()
+    sync = IncrementalSync(
+        client,
+        tmp_path,
+        terminal_statuses=("ANULADA",),
+        max_open_age=timedelta(days=30),
+    )
+    stored_df = stored(
+        [
+            ("open", "VIGENTE", "2025-03-01"),
+            ("cancelled", "ANULADA", "2025-03-01"),
+            ("stale", "VIGENTE", "2024-01-01"),
+            ("just received", "VIGENTE", "2025-03-02"),
+        ]
+    )
+
+    sync.fetch_open(stored_df, pd.Series(["just received"]))
+
+    assert client.requested == ["open"]
+
+
+def test_clients_can_run_without_cache():
+    assert LimitationApiClient(cache=False).cache is None
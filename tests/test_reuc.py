@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pandas as pd
+from reuc import REUCDataProcessor, SubstitutionIndex
+from reuc_sources import ReucSource
+from schemas import REUC_AGENTS, REUC_SUBSTITUTIONS
+
+
+class FrameSource(ReucSource):
+    """Agents and substitutions given as frames."""
+
+    def __init__(self, agents_df, substitutions_df):
+        self.frames = agents_df, substitutions_df
+
+    def load(self):
+        return self.frames
+
+    def version(self) -> str:
+        return "frames"
+
+
+def substitutions(rows) -> pd.DataFrame:
+    columns = [
+        "reuc_old_id",
+        "reuc_new_id",
+        "ReplacementStartDate",
+        "ReplacementEndDate",
+    ]
+    df = pd.DataFrame(rows, columns=columns)
+    df["reuc_new_name"] = "Holder " + df["reuc_new_id"].astype(str)
+    return REUC_SUBSTITUTIONS.apply(df)
+
+
+def test_no_active_substitution():
+    substitutions_df = substitutions(
+        [
+            (1, 2, "2020-01-01", "2020-12-31"),
+            (2, 3, "2030-01-01", "2030-12-31"),
+        ]
+    )
+    index = SubstitutionIndex(substitutions_df, as_of=datetime(2025, 1, 1))
+    assert len(index) == 0
+    assert index.lookup(1) == 1
+
+    units_df = pd.DataFrame(
+        {"reuc_id": pd.array([1, 2], dtype="Int64"), "reuc_name": ["A", "B"]}
+    )
+    agents_df = REUC_AGENTS.apply(units_df)
+    processor = REUCDataProcessor(source=FrameSource(agents_df, substitutions_df))
+    resolved_df = processor.resolve_substitutions(units_df, agents_df, index)
+    pd.testing.assert_frame_equal(resolved_df, units_df)
+
+
+def test_chains_resolve_to_final_holder():
+    substitutions_df = substitutions(
+        [
+            (1, 2, "2020-01-01", "2030-12-31"),
+            (2, 3, "2021-01-01", "2030-12-31"),
+        ]
+    )
+    index = SubstitutionIndex(substitutions_df, as_of=datetime(2025, 1, 1))
+    assert index.lookup(1) == 3
+    assert index.lookup(2) == 3
+
+
+def test_missing_dates_are_not_active():
+    substitutions_df = substitutions(
+        [
+            (1, 2, "2020-01-01", None),
+            (3, 4, None, "2030-12-31"),
+        ]
+    )
+    index = SubstitutionIndex(substitutions_df, as_of=datetime(2025, 1, 1))
+    assert len(index) == 0
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+import requests
+from http_cache import ResponseCache
+from reuc_api import ReucApiClient
+
+
+class StubSession:
+    """Session answering `/v1/empresas/{id}`: 404 for id 404, else the empresa."""
+
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, params=None, **kwargs):
+        self.requested.append(url)
+        reuc_id = int(url.rsplit("/", 1)[-1])
+        resp = requests.Response()
+        resp.url = url
+        if reuc_id == 404:
+            resp.status_code, resp.reason, body = 404, "Not Found", {}
+        else:
+            resp.status_code, resp.reason = 200, "OK"
+            body = {"id": reuc_id, "razonSocial": f"Empresa {reuc_id}"}
+        resp._content = json.dumps(body).encode()
+        resp._content_consumed = True
+        return resp
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = ReucApiClient("http://reuc.test", cache=ResponseCache(tmp_path))
+    client.session = StubSession()
+    return client
+
+
+def test_empresa_ids_are_requested_once(client):
+    empresas_df = client.get_empresas([1, "1", 2, 1.0, None])
+
+    assert sorted(empresas_df["id"].tolist()) == [1, 2]
+    assert sorted(client.session.requested) == [
+        "http://reuc.test/v1/empresas/1",
+        "http://reuc.test/v1/empresas/2",
+    ]
+
+
+def test_missing_empresa_is_none(client):
+    assert client.get_empresa(404) is None
+    assert client.get_empresas([404, 1])["id"].tolist() == [1]
+
+
+def test_empresas_are_served_from_cache_within_ttl(client):
+    client.get_empresas([1, 404])
+    client.get_empresas([1, 404])
+
+    assert len(client.session.requested) == 2
+
+
+def test_empresa_ttl_leaves_shared_cache_alone(tmp_path):
+    cache = ResponseCache(tmp_path, default_ttl=0)
+    client = ReucApiClient("http://reuc.test", cache=cache, empresa_ttl=60)
+
+    assert cache.ttls == {}
+    assert client.empresa_ttl == 60
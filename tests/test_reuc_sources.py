@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pandas as pd
+from checkpoints import CheckpointStore
+from reuc import SubstitutionIndex
+from reuc_sources import ApiReucSource, XlsxReucSource
+
+# The same three agents: 1 is replaced by 2, both PMGD generators.
+AGENTS = [
+    (1, "Solar Uno SpA", "76.000.001-1", ["PMGD", "Generación"], 2),
+    (2, "Solar Dos SpA", "76.000.002-2", ["Generación", "PMGD"], None),
+    (3, "Transmisora SA", "76.000.003-3", [], None),
+]
+
+
+class AgentsClient:
+    """ReucApiClient stand-in returning AGENTS as the coordinados list."""
+
+    def get_agents(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "id": pd.array([row[0] for row in AGENTS], dtype="Int64"),
+                "razonSocial": [row[1] for row in AGENTS],
+                "rut": [row[2] for row in AGENTS],
+                "subcategorias": [
+                    [{"id": 0, "name": n} for n in row[3]] for row in AGENTS
+                ],
+                "reemplazoId": pd.array([row[4] for row in AGENTS], dtype="Int64"),
+            }
+        )
+
+
+def write_workbooks(folder):
+    pd.DataFrame(
+        {
+            "id": [row[0] for row in AGENTS],
+            "Razón Social": [row[1] for row in AGENTS],
+            "Segmento": ["; ".join(row[3]) or None for row in AGENTS],
+        }
+    ).to_excel(folder / "datos_empresas_1.xlsx", sheet_name="Empresas", index=False)
+    by_id = {row[0]: row for row in AGENTS}
+    replaced = [row for row in AGENTS if row[4] is not None]
+    pd.DataFrame(
+        {
+            "ID": [row[0] for row in replaced],
+            "Empresa": [row[1] for row in replaced],
+            "Rut": [row[2] for row in replaced],
+            "ID Reemplazo": [row[4] for row in replaced],
+            "Reemplazada Por": [by_id[row[4]][1] for row in replaced],
+            "Rut Reemplazante": [by_id[row[4]][2] for row in replaced],
+            "Inicio Reemplazo": datetime(2020, 1, 1),
+            "Fin de Reemplazo": datetime(2099, 12, 31),
+        }
+    ).to_excel(folder / "datos_reuc_reemplazos_1.xlsx", index=False)
+
+
+def test_xlsx_and_api_sources_agree(tmp_path):
+    write_workbooks(tmp_path)
+    xlsx = XlsxReucSource(tmp_path, CheckpointStore(tmp_path / "checkpoints"))
+    xlsx_agents_df, xlsx_substitutions_df = xlsx.load()
+    api_agents_df, api_substitutions_df = ApiReucSource(AgentsClient()).load()
+
+    pd.testing.assert_frame_equal(xlsx_agents_df, api_agents_df)
+    categories = api_agents_df["reuc_category"]
+    assert list(categories[:2]) == ["Generación, PMGD"] * 2
+    assert categories.isna()[2]
+
+    columns = ["reuc_old_id", "reuc_old_name", "reuc_new_id", "reuc_new_name"]
+    pd.testing.assert_frame_equal(
+        xlsx_substitutions_df[columns], api_substitutions_df[columns]
+    )
+    xlsx_index = SubstitutionIndex(xlsx_substitutions_df)
+    api_index = SubstitutionIndex(api_substitutions_df)
+    assert xlsx_index.holders == api_index.holders == {1: 2}
@@ -0,0 +1,34 @@
+import pandas as pd
+from schemas import Schema
+
+SCHEMA = Schema({"fecha": "datetime64[ns]"})
+
+
+def test_offsets_are_read_as_naive_utc():
+    df = pd.DataFrame(
+        {
+            "fecha": [
+                "2025-01-01T10:00:00-03:00",
+                "2025-01-01T10:00:00Z",
+                "2025-01-01T12:00:00+02:00",
+                None,
+                "not a date",
+            ]
+        }
+    )
+    fecha = SCHEMA.apply(df)["fecha"]
+
+    assert fecha.dtype == "datetime64[ns]"
+    assert list(fecha[:3]) == [
+        pd.Timestamp("2025-01-01 13:00"),
+        pd.Timestamp("2025-01-01 10:00"),
+        pd.Timestamp("2025-01-01 10:00"),
+    ]
+    assert fecha[3:].isna().all()
+
+
+def test_z_suffix_and_naive_columns_keep_the_schema_dtype():
+    for value in ["2025-01-01T10:00:00Z", "2025-01-01T10:00:00"]:
+        fecha = SCHEMA.apply(pd.DataFrame({"fecha": [value]}))["fecha"]
+        assert fecha.dtype == "datetime64[ns]"
+        assert fecha[0] == pd.Timestamp("2025-01-01 10:00")
@@ -0,0 +1,17 @@
+import pandas as pd
+from snapshot_diff import OCURRENCIA, diff_snapshots, number_duplicates
+
+
+def test_duplicated_keys_are_compared_not_dropped():
+    key = ["Línea", "Paño"]
+    old = pd.DataFrame({"Línea": ["L1", "L1"], "Paño": ["J1", "J1"], "A": [100, 200]})
+    new = old.assign(A=[100, 250])
+
+    diff = diff_snapshots(
+        number_duplicates(old, key, "old"),
+        number_duplicates(new, key, "new"),
+        [*key, OCURRENCIA],
+        columns=["A"],
+    )
+
+    assert len(diff.modified) == 1
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+from ttcc_ratio import RAZON, RELACION, RELACION_ANT, REGLA, TAP, resolve_ratios
+
+# razón(es) Infotécnica, TAP (kA), previous ERST ratio -> ratio, rule
+CASES = {
+    "no Infotécnica data": (None, "0,6", "600/5", "600/5", "1"),
+    "TAP in the ratios": ("300-600/5-5", "0,6", "400/5", "600/5", "2.1"),
+    "TAP not in the ratios": ("300-600/1-5", "0,4", "300/5", "300/5", "2.2.1"),
+    "missing TAP": ("300-600/5", None, "600/5", "600/5", "2.2.1"),
+    "nothing consistent": ("300-600/5", "0,4", "800/5", None, "2.2.2"),
+    "missing TAP and ratio": ("300-600/5", None, None, None, "2.2.2"),
+}
+
+
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES.keys())
+def test_decision_rules(case):
+    razon, tap, ant, relacion, regla = case
+    df = resolve_ratios(pd.DataFrame({RAZON: [razon], TAP: [tap], RELACION_ANT: [ant]}))
+
+    assert df[REGLA][0] == regla
+    if relacion is None:
+        assert pd.isna(df[RELACION][0])
+    else:
+        assert df[RELACION][0] == relacion
+
+
+def test_rules_are_applied_row_by_row():
+    cases = list(CASES.values())
+    df = resolve_ratios(
+        pd.DataFrame(
+            {
+                RAZON: [case[0] for case in cases],
+                TAP: [case[1] for case in cases],
+                RELACION_ANT: [case[2] for case in cases],
+            }
+        )
+    )
+    assert df[REGLA].tolist() == [case[4] for case in cases]
@@ -0,0 +1,305 @@
+import pandas as pd
+from pathlib import Path
+import bay_index
+from bay_index import COINCIDENCIA, CONFIANZA, BayIndex, split_bay_names
+import ficha_crawler
+import ficha_snapshots
+from ficha_snapshots import FichaSnapshotStore, list_fingerprints
+import infotecnica
+from infotecnica import InfotecnicaClient
+import line_capacity
+from line_capacity import to_mva
+import name_normalizer
+from name_normalizer import is_bay_name, normalize_names
+from pipeline import Pipeline
+import snapshot_diff
+from snapshot_diff import OCURRENCIA, SnapshotDiff, diff_snapshots, number_duplicates
+import ttcc_ratio
+from ttcc_ratio import RELACION, RELACION_ANT, REGLA, resolve_ratios
+import zone_workbooks
+from zone_workbooks import ZONA, read_zones, write_zones
+
+# Pipeline of the ERST TTCC tables (port of Old/TTCC_ERST_v2025-07.py).
+# Manual steps between runs:
+# - From "df_TTCC_SEN_2.xlsx", build "df_TTCC_SEN_2_2.xlsx": fix duplicated
+#   extremos and delete rows of tap-offs, extremos without TTCC or tramos that
+#   no longer exist.
+# - From "df_TTCC_SEN_7.xlsx", build "df_TTCC_SEN_7_2.xlsx": fill in the empty
+#   "Relación de transformación" (relay print-outs) and missing Vnom, and
+#   delete rows of tap-offs, extremos without breakers or missing tramos.
+
+RESOURCE = "transformadores-corrientes"
+# Modules the ficha stages run, part of their memoization key
+FICHA_CODE = (infotecnica, ficha_crawler, ficha_snapshots)
+
+categorias_TTCC_general = {
+    "458": "Razón(es) de transformación",
+    "6177": "TAP seleccionado del primario",
+}
+
+lista_reordenada = [
+    "Zona",
+    "Nombre Línea",
+    "Nombre Circuito",
+    "nombre_tramo",
+    "Tensión nominal (kV)",
+    "Subestación",
+    "Paño",
+    "id_TC",
+    COINCIDENCIA,
+    CONFIANZA,
+    "Razón(es) de transformación",
+    "TAP seleccionado del primario",
+    "Tap transformado",
+    "Contenido",
+    "Relación de transformación_IT",
+]
+
+# Lista final sin id_TC, ya que hay varios TTCC que no están en IT y cuyos datos
+# se obtienen o validan con printouts relés. Además, en SS/EE de interruptor y
+# medio se selecciona solo el 1ero de los TTCC de cada paño.
+lista_filtrada = [
+    "Zona",
+    "Nombre Línea",
+    "Nombre Circuito",
+    "Subestación",
+    "Paño",
+    "Relación de transformación",
+    "Capacidad (A)",
+    "Capacidad (MVA)",
+]
+
+# Identificación de cada fila de las tablas TTCC finales
+clave_TTCC = ["Nombre Línea", "Nombre Circuito", "Subestación", "Paño"]
+clave_TTCC_diff = [*clave_TTCC, OCURRENCIA]
+
+
+def build_pipeline(
+    client: InfotecnicaClient | None = None,
+    store: FichaSnapshotStore | None = None,
+) -> Pipeline:
+    client = client or InfotecnicaClient()
+    store = store or FichaSnapshotStore()
+    pipeline = Pipeline("ttcc_erst")
+
+    @pipeline.stage(inputs=("lineas_erst_2_file",), code=(zone_workbooks,))
+    def ttcc_sen(lineas_erst_2_file):
+        # Creación dataframe TTCC con datos de tramos de "Lineas_ERST_2.xlsx"
+        columnas = [
+            "Nombre Línea",
+            "Nombre Circuito",
+            "Tensión nominal (kV)",
+            "id_tramo",
+        ]
+        df_TTCC_SEN = read_zones(lineas_erst_2_file, usecols=columnas)
+        # Elimina filas sin datos y reduce tramos con subtramos a una fila
+        return df_TTCC_SEN.dropna(how="all", subset=columnas).drop_duplicates(
+            subset=[ZONA, "id_tramo"]
+        )
+
+    @pipeline.stage(outputs=("tramos",), ttl=24 * 3600)
+    def fetch_tramos():
+        return client.get_data("tramos/")
+
+    @pipeline.stage(
+        inputs=("ttcc_sen", "tramos"),
+        code=(name_normalizer,),
+    )
+    def ttcc_sen_extremos(df_TTCC_SEN, df_tramos):
+        # Merge de dataframe TTCC con datos tramos, 1 fila por extremo
+        df_tramos = df_tramos.rename(
+            columns={"id": "id_tramo", "nombre": "nombre_tramo"}
+        )
+        df_tramos_ext1 = df_tramos[
+            ["id_tramo", "nombre_tramo", "extremo1_descripcion"]
+        ].rename(columns={"extremo1_descripcion": "extremo"})
+        df_tramos_ext2 = df_tramos[
+            ["id_tramo", "nombre_tramo", "extremo2_descripcion"]
+        ].rename(columns={"extremo2_descripcion": "extremo"})
+
+        df_TTCC_SEN = pd.concat(
+            [
+                df_TTCC_SEN.merge(df_tramos_ext1, on="id_tramo", how="left"),
+                df_TTCC_SEN.merge(df_tramos_ext2, on="id_tramo", how="left"),
+            ]
+        )
+        # 'mergesort' mantiene orden relativo: primero extremo1 y luego extremo2
+        df_TTCC_SEN = df_TTCC_SEN.sort_index(kind="mergesort")
+
+        # Limpieza columna "extremo" (ver name_normalizer) y filtrado de
+        # extremos correspondientes a taps y estructuras, sin TTCC
+        df_TTCC_SEN["extremo"] = normalize_names(df_TTCC_SEN["extremo"])
+        df_TTCC_SEN = df_TTCC_SEN[is_bay_name(df_TTCC_SEN["extremo"])]
+        return df_TTCC_SEN
+
+    @pipeline.stage(inputs=("ttcc_sen_extremos", "ttcc_sen_2_file"))
+    def export_ttcc_sen_extremos(df_TTCC_SEN, ttcc_sen_2_file):
+        # Para revisión manual, que genera "df_TTCC_SEN_2_2.xlsx"
+        df_TTCC_SEN.to_excel(ttcc_sen_2_file, index=False)
+        return str(ttcc_sen_2_file)
+
+    @pipeline.stage(outputs=("ttcc",), ttl=24 * 3600, code=(infotecnica,))
+    def fetch_ttcc():
+        # Consulta datos TTCC
+        return client.get_data_by_pages(RESOURCE)
+
+    @pipeline.stage(inputs=("ttcc",), code=FICHA_CODE)
+    def ttcc_general(df_TTCC):
+        # DATOS GENERALES TTCC. Sólo se consultan TTCC nuevos o modificados.
+        df, failures = client.fetch_fichas(
+            RESOURCE,
+            df_TTCC["id"].tolist(),
+            list(categorias_TTCC_general),
+            "general",
+            categorias_TTCC_general,
+            store=store,
+            fingerprints=list_fingerprints(df_TTCC),
+        )
+        if len(failures):
+            print(failures.to_string(index=False))
+        return df
+
+    @pipeline.stage(inputs=("ttcc", "ttcc_general"))
+    def ttcc_it(df_TTCC, df_TTCC_general):
+        merged_df_TTCC = df_TTCC[["id", "subestacion_nombre", "pano_nombre", "nombre"]]
+        merged_df_TTCC = merged_df_TTCC.merge(df_TTCC_general, on="id", how="outer")
+        return merged_df_TTCC.rename(columns={"id": "id_TC", "nombre": "nombre_TC"})
+
+    @pipeline.stage(
+        inputs=("ttcc_sen_2_2_file", "ttcc_it", "ct_policy"),
+        code=(name_normalizer, bay_index),
+    )
+    def ttcc_sen_merged(ttcc_sen_2_2_file, df_TTCC, ct_policy):
+        # Merge de dataframe TTCC con datos TTCC Infotécnica por (Subestación,
+        # Paño): exacto y, si no, aproximado, con "Coincidencia" y "Confianza"
+        # para la revisión (ver bay_index).
+        df_TTCC_SEN = pd.read_excel(ttcc_sen_2_2_file)
+        df_TTCC_SEN["extremo"] = normalize_names(df_TTCC_SEN["extremo"])
+        df_TTCC_SEN[["Subestación", "Paño"]] = split_bay_names(df_TTCC_SEN["extremo"])
+
+        # Puede haber varios TTCC por paño (SSEE de interruptor y medio): con
+        # ct_policy="first" se deja el 1er TC del paño, que en general tiene
+        # datos de protección. Misma normalización que "extremo".
+        df_TTCC = df_TTCC.assign(pano_nombre=normalize_names(df_TTCC["pano_nombre"]))
+        return BayIndex(df_TTCC, policy=ct_policy).match(df_TTCC_SEN)
+
+    @pipeline.stage(
+        inputs=("ttcc_sen_merged", "ttcc_erst_ant_file"),
+        code=(ttcc_ratio, zone_workbooks),
+    )
+    def ttcc_sen_ant(df_TTCC_SEN, ttcc_erst_ant_file):
+        # Merge con tablas TTCC de corrida anterior, para usar cuando no hay
+        # datos del TC en Infotécnica o los datos son inconsistentes.
+        df_TTCC_SEN_ant = read_zones(
+            ttcc_erst_ant_file, usecols=["Subestación", "Paño", RELACION]
+        ).drop(columns=ZONA)
+        # Separa pares de paños de SSEE de interruptor y medio ("paño1/paño2")
+        df_TTCC_SEN_ant["Paño"] = df_TTCC_SEN_ant["Paño"].str.split("/")
+        df_TTCC_SEN_ant = df_TTCC_SEN_ant.explode("Paño").drop_duplicates(
+            subset=["Subestación", "Paño"]
+        )
+
+        df_TTCC_SEN = df_TTCC_SEN.merge(
+            df_TTCC_SEN_ant, on=["Subestación", "Paño"], how="left"
+        ).rename(columns={RELACION: RELACION_ANT})
+
+        # Relación de transformación según reglas 1 / 2.1 / 2.2.1 / 2.2.2,
+        # con la regla aplicada en "Regla relación" (ver ttcc_ratio)
+        df_TTCC_SEN = resolve_ratios(df_TTCC_SEN)
+        return df_TTCC_SEN[
+            [*lista_reordenada, RELACION_ANT, "Contenido_ant", "Apri_ant"]
+            + [RELACION, REGLA]
+        ]
+
+    @pipeline.stage(inputs=("ttcc_sen_ant", "ttcc_sen_7_file"))
+    def export_ttcc_sen_ant(df_TTCC_SEN, ttcc_sen_7_file):
+        # Para completar a mano, lo que genera "df_TTCC_SEN_7_2.xlsx"
+        df_TTCC_SEN.to_excel(ttcc_sen_7_file, index=False)
+        return str(ttcc_sen_7_file)
+
+    @pipeline.stage(inputs=("ttcc_sen_7_2_file",), code=(line_capacity,))
+    def ttcc_final(ttcc_sen_7_2_file):
+        # Cálculo capacidad en A y en MVA
+        df_TTCC_SEN = pd.read_excel(ttcc_sen_7_2_file)
+        df_TTCC_SEN["Apri"] = pd.to_numeric(
+            df_TTCC_SEN["Relación de transformación"].str.split("/").str[0],
+            errors="coerce",
+        )
+        df_TTCC_SEN["Capacidad (A)"] = df_TTCC_SEN["Apri"] * 1.2
+        df_TTCC_SEN["Capacidad (MVA)"] = to_mva(
+            df_TTCC_SEN["Capacidad (A)"] / 1000, df_TTCC_SEN["Tensión nominal (kV)"]
+        )
+        return df_TTCC_SEN[lista_filtrada]
+
+    @pipeline.stage(
+        inputs=("ttcc_final", "ttcc_erst_final_file"), code=(zone_workbooks,)
+    )
+    def export_ttcc_final(df_TTCC_SEN, ttcc_erst_final_file):
+        write_zones(df_TTCC_SEN, ttcc_erst_final_file, na_rep="-")
+        return str(ttcc_erst_final_file)
+
+    @pipeline.stage(
+        inputs=("ttcc_final", "ttcc_erst_ant_file"),
+        outputs=("ttcc_nuevos", "ttcc_eliminados", "ttcc_modificados"),
+        code=(snapshot_diff, zone_workbooks),
+    )
+    def ttcc_diff(df_TTCC_SEN, ttcc_erst_ant_file):
+        # Comparación con tablas TTCC de corrida anterior, por línea y paño
+        df_TTCC_SEN_ant = read_zones(ttcc_erst_ant_file).drop(columns=ZONA)
+        # Claves repetidas se informan y se comparan en orden de aparición
+        diff = diff_snapshots(
+            number_duplicates(df_TTCC_SEN_ant, clave_TTCC, "TTCC anterior"),
+            number_duplicates(df_TTCC_SEN.drop(columns=ZONA), clave_TTCC, "TTCC"),
+            clave_TTCC_diff,
+            columns=[RELACION, "Capacidad (A)", "Capacidad (MVA)"],
+        )
+        print(f"TTCC: {diff.summary()}")
+        return diff.added, diff.removed, diff.modified
+
+    @pipeline.stage(
+        inputs=(
+            "ttcc_nuevos",
+            "ttcc_eliminados",
+            "ttcc_modificados",
+            "ttcc_cambios_file",
+        )
+    )
+    def export_ttcc_cambios(df_nuevos, df_eliminados, df_modificados, file):
+        # Reporte de cambios respecto de la corrida anterior, para revisión
+        SnapshotDiff(
+            clave_TTCC_diff, df_nuevos, df_eliminados, df_modificados
+        ).to_excel(file)
+        return str(file)
+
+    return pipeline
+
+
+def default_params(folder: Path = Path("Datos")) -> dict:
+    return {
+        "lineas_erst_2_file": folder / "Lineas_ERST_2.xlsx",
+        "ttcc_sen_2_file": folder / "df_TTCC_SEN_2.xlsx",
+        "ttcc_sen_2_2_file": folder / "df_TTCC_SEN_2_2.xlsx",
+        "ttcc_erst_ant_file": folder / "TTCC_ERST_final_ant.xlsx",
+        "ttcc_sen_7_file": folder / "df_TTCC_SEN_7.xlsx",
+        "ttcc_sen_7_2_file": folder / "df_TTCC_SEN_7_2.xlsx",
+        "ttcc_erst_final_file": folder / "TTCC_ERST_final.xlsx",
+        "ttcc_cambios_file": folder / "Cambios_TTCC.xlsx",
+        # TC kept per paño: "first", "last" or "all" (see bay_index.POLICIES)
+        "ct_policy": "first",
+    }
+
+
+if __name__ == "__main__":
+    params = default_params()
+    pipeline = build_pipeline()
+
+    # Step 1: extremos of the ERST tramos, for the manual review
+    pipeline.run(["export_ttcc_sen_extremos"], params)
+
+    # Step 2: ratios from Infotécnica and the previous ERST, to be completed by hand
+    if params["ttcc_sen_2_2_file"].exists():
+        pipeline.run(["export_ttcc_sen_ant"], params)
+
+    # Step 3: final capacities
+    if params["ttcc_sen_7_2_file"].exists():
+        pipeline.run(["export_ttcc_final", "export_ttcc_cambios"], params)
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+RAZON = "Razón(es) de transformación"
+TAP = "TAP seleccionado del primario"
+RELACION = "Relación de transformación"
+RELACION_IT = "Relación de transformación_IT"
+RELACION_ANT = "Relación de transformación_ant"
+REGLA = "Regla relación"
+
+NUMBER = r"(\d+(?:[.,]\d+)?)"
+
+# Decision rules for "Relación de transformación":
+# 1     No data of the CT in Infotécnica -> previous ERST ratio
+# 2.1   Primary TAP found in the CT ratios -> Infotécnica ratio (TAP/A sec)
+# 2.2.1 Otherwise, previous ERST Apri and Asec both found in the CT ratios
+#       -> previous ERST ratio
+# 2.2.2 Otherwise -> empty (checked later against relay print-outs)
+RULES = ("1", "2.1", "2.2.1", "2.2.2")
+
+
+def as_text(values: pd.Series) -> pd.Series:
+    """Positional string Series with <NA> for missing values."""
+    return pd.Series(values.to_numpy(dtype=object)).astype("string")
+
+
+def to_float(values: pd.Series) -> np.ndarray:
+    """Decimal-comma text to floats; anything else becomes NaN."""
+    return pd.to_numeric(
+        as_text(values).str.replace(",", "."), errors="coerce"
+    ).to_numpy(dtype=float)
+
+
+def parse_ratio_numbers(razon: pd.Series) -> np.ndarray:
+    """Every number of each "Razón(es) de transformación" text, in order.
+
+    Returns a 2-D float array with one row per text, padded with NaN.
+    """
+    matches = as_text(razon).str.extractall(NUMBER)[0]
+    rows = matches.index.get_level_values(0).to_numpy(dtype=int)
+    cols = matches.index.get_level_values(1).to_numpy(dtype=int)
+
+    numbers = np.full((len(razon), cols.max() + 1 if len(cols) else 1), np.nan)
+    numbers[rows, cols] = pd.to_numeric(
+        matches.str.replace(",", "."), errors="coerce"
+    ).to_numpy(dtype=float)
+    return numbers
+
+
+def contains(numbers: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Whether each value is one of the numbers of its row (NaN never is)."""
+    return np.isclose(numbers, values[:, None], rtol=0, atol=1e-6).any(axis=1)
+
+
+def first_secondary(razon: pd.Series) -> pd.Series:
+    """First number after the first "/", i.e. the secondary current in A."""
+    return (
+        as_text(razon)
+        .str.split("/", n=2)
+        .str[1]
+        .str.replace(",", ".")
+        .str.extract(r"([-+]?\d*\.?\d+)")[0]
+    )
+
+
+def resolve_ratios(df: pd.DataFrame) -> pd.DataFrame:
+    """Choose the "Relación de transformación" of every TTCC row at once.
+
+    `df` needs the Infotécnica columns "Razón(es) de transformación" and
+    "TAP seleccionado del primario" (kA) and the previous ERST column
+    "Relación de transformación_ant". The ratios are parsed once into a
+    numeric array, and the consistency checks and decision rules are
+    evaluated with vectorized masks. Added columns: "Tap transformado",
+    "Contenido", "Relación de transformación_IT", "Contenido_ant",
+    "Apri_ant", "Relación de transformación" and "Regla relación", the
+    rule of `RULES` applied to the row.
+    """
+    df = df.copy()
+    numbers = parse_ratio_numbers(df[RAZON])
+    has_it = df[RAZON].notna().to_numpy()
+
+    # --- Infotécnica: primary TAP (kA -> A) consistent with the ratios ---
+    tap = np.round(to_float(df[TAP]) * 1000, 6)
+    contenido = has_it & contains(numbers, tap)
+    a_sec = first_secondary(df[RAZON])
+    tap_int = pd.array(np.round(tap), dtype="Int64")
+
+    df["Tap transformado"] = tap_int
+    df["Contenido"] = contenido
+    valida = contenido & a_sec.notna().to_numpy()
+    df[RELACION_IT] = np.where(
+        valida,
+        pd.Series(tap_int).astype("string").to_numpy(dtype=object)
+        + "/"
+        + a_sec.fillna("").to_numpy(dtype=object),
+        "",
+    )
+
+    # --- Previous ERST: Apri and Asec both found in the ratios ---
+    partes_ant = as_text(df[RELACION_ANT]).str.split("/", n=1)
+    apri_ant = to_float(partes_ant.str[0])
+    asec_ant = to_float(partes_ant.str[1])
+    contenido_ant = has_it & contains(numbers, apri_ant) & contains(numbers, asec_ant)
+
+    df["Contenido_ant"] = contenido_ant
+    df["Apri_ant"] = apri_ant
+
+    # --- Decision rules ---
+    conditions = [~has_it, contenido, contenido_ant]
+    ant = df[RELACION_ANT].to_numpy(dtype=object)
+    df[RELACION] = np.select(
+        conditions, [ant, df[RELACION_IT].to_numpy(dtype=object), ant], np.nan
+    )
+    df[REGLA] = np.select(conditions, RULES[:3], RULES[3])
+    return df
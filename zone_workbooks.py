@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+ZONA = "Zona"
+
+
+def read_zones(file: Path, zone_column: str = ZONA, **kwargs) -> pd.DataFrame:
+    """Read every sheet of a zone workbook into one frame.
+
+    The sheet name goes to `zone_column`, a categorical whose categories keep
+    the sheet order, so `write_zones` writes the sheets back in that order
+    (empty ones included). `kwargs` are passed to `pd.read_excel`.
+    """
+    sheets = pd.read_excel(file, sheet_name=None, **kwargs)
+    df = pd.concat(
+        [sheet.assign(**{zone_column: zona}) for zona, sheet in sheets.items()],
+        ignore_index=True,
+    )
+    df[zone_column] = pd.Categorical(df[zone_column], categories=list(sheets))
+    return df[[zone_column, *df.columns.drop(zone_column)]]
+
+
+def write_zones(
+    df: pd.DataFrame, file: Path, zone_column: str = ZONA, na_rep: str = ""
+) -> Path:
+    """Write `df` to `file` with one sheet per zone, without `zone_column`.
+
+    Rows are grouped once and streamed through a write-only workbook, with
+    missing values replaced by `na_rep` row by row, so memory does not grow
+    with the number of cells. Sheets follow the
+    categories of a categorical `zone_column`, else the order of appearance.
+    """
+    zonas = df[zone_column]
+    if isinstance(zonas.dtype, pd.CategoricalDtype):
+        order = list(zonas.cat.categories)
+    else:
+        order = list(pd.unique(zonas.dropna()))
+    positions = df.groupby(zone_column, sort=False, observed=True).indices
+
+    data = df.drop(columns=zone_column)
+
+    workbook = Workbook(write_only=True)
+    for zona in order:
+        sheet = workbook.create_sheet(title=str(zona))
+        header = []
+        for column in data.columns:
+            cell = WriteOnlyCell(sheet, value=str(column))
+            cell.font = Font(bold=True)
+            header.append(cell)
+        sheet.append(header)
+        rows = data.iloc[positions.get(zona, [])]
+        for row in rows.itertuples(index=False, name=None):
+            sheet.append([na_rep if pd.isna(value) else value for value in row])
+    workbook.save(file)
+    return Path(file)